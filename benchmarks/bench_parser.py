@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.log_generator import LogGenerator
+from src.event_parse import EventParse
+from src.log_classifier import LogClassifier
+from src.stream_monitor import StreamMonitor
+from src.utils import Utils, LOG_PATTERN
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CORPUS = os.path.join(HERE, 'corpus.log')
+RESULTS = os.path.join(HERE, 'results.jsonl')
+
+
+def best_of(repeat, func, items):
+    # Fastest of `repeat` passes, in seconds
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(items)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_normalize_date(stamps):
+    for stamp in stamps:
+        Utils.normalize_date(stamp)
+
+
+def run_parse_log(lines):
+    for line in lines:
+        StreamMonitor.parse_log(line)
+
+
+def run_parse_event(logs):
+    for log in logs:
+        StreamMonitor.parse_event(log, 'bench')
+
+
+def run_check_log(logs):
+    for log in logs:
+        EventParse.check_log(log, 'bench')
+
+
+def run_classify_line(lines):
+    for line in lines:
+        LogClassifier.classify_line(line, 'bench')
+
+
+def run_classify_bytes(lines):
+    for line in lines:
+        LogClassifier.classify_bytes(line, 'bench')
+
+
+def measure_allocations(lines):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+
+    events = [LogClassifier.classify_line(line, 'bench') for line in lines]
+
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    kept = sum(1 for event in events if event)
+    return {
+        'Peak KiB': round((peak - before) / 1024, 1),
+        'Retained Bytes Per Event': round((retained - before) / kept) if kept else 0,
+    }
+
+
+def git_revision():
+    # A run on uncommitted changes is marked '-dirty': it measures the tree, not HEAD
+    try:
+        return subprocess.check_output(['git', 'describe', '--always', '--dirty'], cwd=HERE, stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def load_lines(args):
+    if args.synthetic:
+        return list(LogGenerator(seed=args.seed).lines(args.synthetic))
+
+    with open(args.corpus, encoding='utf-8') as f:
+        lines = [line.rstrip('\n') for line in f if line.strip()]
+
+    # Repeat the corpus so every stage runs long enough to time
+    return lines * max(1, args.min_lines // len(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the log parser stages')
+    parser.add_argument('--corpus', type=str, default=CORPUS, help='Log file to benchmark against')
+    parser.add_argument('--synthetic', type=int, default=0, help='Use N generated lines instead of the corpus')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for generated lines')
+    parser.add_argument('--min-lines', type=int, default=100000, help='Repeat the corpus up to at least this many lines')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed passes per stage, the fastest is reported')
+    parser.add_argument('--record', action='store_true', help=f'Append the result to {os.path.relpath(RESULTS)}')
+    parser.add_argument('--label', type=str, default='', help='Free-form note stored with a recorded result')
+
+    args = parser.parse_args()
+
+    lines = load_lines(args)
+    stamps = [LOG_PATTERN.match(line).group('datetime') for line in lines]
+    logs = [log for log in (StreamMonitor.parse_log(line) for line in lines) if log]
+
+    stages = {
+        'normalize_date': (run_normalize_date, stamps),
+        'parse_log': (run_parse_log, lines),
+        'parse_event': (run_parse_event, logs),
+        'check_log': (run_check_log, logs),
+        'classify_line': (run_classify_line, lines),
+        'classify_bytes': (run_classify_bytes, [line.encode('utf-8') for line in lines]),
+    }
+
+    result = {
+        'Date': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S'),
+        'Revision': git_revision(),
+        'Python': platform.python_version(),
+        'Source': f"synthetic:{args.synthetic}:{args.seed}" if args.synthetic else os.path.relpath(args.corpus, HERE),
+        'Lines': len(lines),
+        'Label': args.label,
+        'Stages': {},
+    }
+
+    print(f"{len(lines)} lines, best of {args.repeat}")
+    print(f"{'stage':<16}{'lines/sec':>14}{'ns/line':>12}")
+
+    for name, (func, items) in stages.items():
+        elapsed = best_of(args.repeat, func, items)
+        rate = len(items) / elapsed
+        result['Stages'][name] = {'Lines Per Second': round(rate), 'Nanoseconds Per Line': round(elapsed / len(items) * 1e9)}
+        print(f"{name:<16}{rate:>14,.0f}{elapsed / len(items) * 1e9:>12,.0f}")
+
+    result['Allocations'] = measure_allocations(lines)
+    print(f"classify_line allocations: {result['Allocations']}")
+
+    if args.record:
+        with open(RESULTS, 'a') as f:
+            f.write(json.dumps(result) + '\n')
+        print(f"Recorded to {RESULTS}")
+
+
+if __name__ == '__main__':
+    main()
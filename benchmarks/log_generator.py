@@ -0,0 +1,119 @@
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+# Default mix, roughly what a synced node prints at debug verbosity
+DEFAULT_RATIOS = {
+    'idle': 0.08,
+    'preparing': 0.005,
+    'syncing': 0.02,
+    'pending': 0.005,
+    'claimed': 0.01,
+    'noise': 0.88,
+}
+
+NOISE = [
+    'Consensus: sc_informant: ✨ Imported #{best} (0x{hash_a}…{hash_b})',
+    'Consensus: libp2p_kad::behaviour: Request to PeerId("12D3KooW{peer}") in query QueryId({query}) failed with Io(Custom {{ kind: ConnectionRefused }})',
+    'Consensus: sync: 🔍 Sending block announce to {peers} peers',
+    'Consensus: sub-libp2p: Libp2p => Connected(PeerId("12D3KooW{peer}"))',
+    'Consensus: subspace_service::sync_from_dsn: Imported segment index {query}',
+    'Domain: sc_basic_authorship: 🎁 Prepared block for proposing at {best} ({query} ms)',
+    'Consensus: txpool: [0x{hash_a}] Importing transaction to pool',
+]
+
+
+def speed(rng):
+    value = round(rng.uniform(0, 999), 1)
+    return f"{value}{rng.choice(['kiB/s', 'MiB/s', 'kiB/s', 'kiB/s'])}" if value else '0 B/s'
+
+
+class LogGenerator:
+    """
+    Synthetic subspace node log lines in the docker log format the stream
+    monitor reads. Chain state (best/finalized/peers) moves forward between
+    lines so consecutive status lines look like a real node.
+    """
+
+    def __init__(self, ratios=None, seed=0, start=None):
+        self.ratios = ratios or DEFAULT_RATIOS
+        self.rng = random.Random(seed)
+        self.now = start or datetime(2024, 5, 20, 12, 0, 0, tzinfo=timezone.utc)
+        self.best = 1200000
+        self.finalized = self.best - 100
+        self.target = self.best + 50000
+        self.peers = 40
+        self.slot = 7000000
+
+    def timestamp(self):
+        self.now += timedelta(microseconds=self.rng.randint(100, 200000))
+        return self.now.strftime('%Y-%m-%dT%H:%M:%S.%f') + f"{self.rng.randint(0, 999):03d}Z"
+
+    def fields(self):
+        self.best += self.rng.randint(0, 2)
+        self.finalized = self.best - 100
+        self.peers = max(0, min(60, self.peers + self.rng.randint(-1, 1)))
+        self.slot += self.rng.randint(1, 6)
+
+        return {
+            'best': self.best,
+            'finalized': self.finalized,
+            'target': self.target,
+            'peers': self.peers,
+            'slot': self.slot,
+            'bps': round(self.rng.uniform(0.1, 80), 1),
+            'down': speed(self.rng),
+            'up': speed(self.rng),
+            'hash_a': f"{self.rng.getrandbits(16):04x}",
+            'hash_b': f"{self.rng.getrandbits(16):04x}",
+            'peer': f"{self.rng.getrandbits(64):016x}",
+            'query': self.rng.randint(1, 99999),
+        }
+
+    def message(self, kind, f):
+        if kind == 'idle':
+            return f"Consensus: substrate: 💤 Idle ({f['peers']} peers), best: #{f['best']} (0x{f['hash_a']}…{f['hash_b']}), finalized #{f['finalized']} (0x{f['hash_b']}…{f['hash_a']}), ⬇ {f['down']} ⬆ {f['up']}"
+        if kind == 'preparing':
+            return f"Consensus: substrate: ⚙️  Preparing {f['bps']} bps, target=#{f['target']} ({f['peers']} peers), best: #{f['best']} (0x{f['hash_a']}…{f['hash_b']}), finalized #{f['finalized']} (0x{f['hash_b']}…{f['hash_a']}), ⬇ {f['down'].replace('0 B/s', '0.0kiB/s')} ⬆ {f['up'].replace('0 B/s', '0.0kiB/s')}"
+        if kind == 'syncing':
+            return f"Consensus: substrate: ⚙️  Syncing {f['bps']} bps, target=#{f['target']} ({f['peers']} peers), best: #{f['best']} (0x{f['hash_a']}…{f['hash_b']}), finalized #{f['finalized']} (0x{f['hash_b']}…{f['hash_a']}), ⬇ {f['down'].replace('0 B/s', '0.0kiB/s')} ⬆ {f['up'].replace('0 B/s', '0.0kiB/s')}"
+        if kind == 'pending':
+            return f"Consensus: substrate: ⏳ Pending ({f['peers']} peers), best: #{f['best']} (0x{f['hash_a']}…{f['hash_b']}), finalized #{f['finalized']} (0x{f['hash_b']}…{f['hash_a']}), ⬇ {f['down'].replace('0 B/s', '0.0kiB/s')} ⬆ {f['up'].replace('0 B/s', '0.0kiB/s')}"
+        if kind == 'claimed':
+            claim = self.rng.choice(['🗳️ Claimed vote', '🔖 Claimed block'])
+            return f"Consensus: subspace: {claim} at slot={f['slot']}"
+
+        return self.rng.choice(NOISE).format(**f)
+
+    def lines(self, count):
+        kinds = list(self.ratios)
+        weights = [self.ratios[kind] for kind in kinds]
+
+        for kind in self.rng.choices(kinds, weights, k=count):
+            level = 'DEBUG' if kind == 'noise' and self.rng.random() < 0.7 else 'INFO'
+            yield f"{self.timestamp()} {level:>5} {self.message(kind, self.fields())}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic subspace node logs')
+    parser.add_argument('-n', '--lines', type=int, default=100000, help='Number of lines to generate')
+    parser.add_argument('-o', '--output', type=str, default='-', help='Output file, - for stdout')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    for kind, ratio in DEFAULT_RATIOS.items():
+        parser.add_argument(f'--{kind}', type=float, default=ratio, help=f'Relative weight of {kind} lines')
+
+    args = parser.parse_args()
+    ratios = {kind: getattr(args, kind) for kind in DEFAULT_RATIOS}
+    generator = LogGenerator(ratios, args.seed)
+
+    if args.output == '-':
+        for line in generator.lines(args.lines):
+            print(line)
+    else:
+        with open(args.output, 'w') as f:
+            for line in generator.lines(args.lines):
+                f.write(line + '\n')
+
+
+if __name__ == '__main__':
+    main()
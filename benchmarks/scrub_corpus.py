@@ -0,0 +1,70 @@
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+BASE58 = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+# Identifying values in node output. Block hashes and heights are public
+# chain data and stay as captured, so parser work on them is unchanged.
+PEER_ID = re.compile(r'12D3KooW[1-9A-HJ-NP-Za-km-z]+')
+IPV4 = re.compile(r'\b(?:\d{1,3}\.){3}\d{1,3}\b')
+SS58 = re.compile(r'\bs[tu][1-9A-HJ-NP-Za-km-z]{45,47}\b')
+NODE_NAME = re.compile(r'(Node name: ).*')
+
+
+class Scrubber:
+    """
+    Replaces peer IDs, IP addresses, reward addresses and the node name in
+    captured node output with salted pseudonyms of the same length and
+    alphabet, so scrubbed lines cost the parser what the originals did.
+    A value maps to the same pseudonym everywhere in one run.
+    """
+
+    def __init__(self, salt=None):
+        self.salt = salt or os.urandom(16)
+
+    def digest(self, value, length=32):
+        return hashlib.shake_256(self.salt + value.encode('utf-8')).digest(length)
+
+    def base58(self, value, prefix):
+        digest = self.digest(value, len(value) - len(prefix))
+        return prefix + ''.join(BASE58[byte % 58] for byte in digest)
+
+    def ip(self, match):
+        digest = self.digest(match.group(0))
+        return f"10.{digest[0]}.{digest[1]}.{digest[2]}"
+
+    def line(self, line):
+        line = PEER_ID.sub(lambda match: self.base58(match.group(0), '12D3KooW'), line)
+        line = SS58.sub(lambda match: self.base58(match.group(0), match.group(0)[:2]), line)
+        line = IPV4.sub(self.ip, line)
+        return NODE_NAME.sub(lambda match: f"{match.group(1)}node-{self.digest(match.group(0)).hex()[:8]}", line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrub captured node output into a benchmark corpus')
+    parser.add_argument('input', type=str, help="Captured log, e.g. from 'docker logs <node container> > node.log'")
+    parser.add_argument('-o', '--output', type=str, default=None, help='Corpus file to write, stdout when omitted')
+    parser.add_argument('--skip', type=int, default=0, help='Lines to skip from the start of the capture')
+    parser.add_argument('--lines', type=int, default=None, help='Keep at most this many lines after --skip')
+    args = parser.parse_args()
+
+    scrubber = Scrubber()
+    out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+
+    with open(args.input, encoding='utf-8', errors='replace') as f:
+        for index, line in enumerate(f):
+            if index < args.skip:
+                continue
+            if args.lines is not None and index >= args.skip + args.lines:
+                break
+            out.write(scrubber.line(line))
+
+    if out is not sys.stdout:
+        out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,114 @@
 import argparse
 
+from src.backfill import Backfill
+from src.event_batcher import EventBatcher
 from src.logger import logger
+from src.nexus_api import NexusAPI
 from src.node import Node
 
 def main():
     parser = argparse.ArgumentParser(description='SpacePort Node')
 
-    parser.add_argument('-s', '--server', type=str, required=True, help='Server IP address')
+    parser.add_argument('-s', '--server', type=str, help='Server IP address')
+    parser.add_argument('--docker-host', action='append', default=[], help='Fleet mode: label=url of a docker daemon to monitor (tcp://10.0.0.5:2375, unix:///var/run/docker.sock), repeat per host; events then come from label/container')
     parser.add_argument('-n', '--nexus', type=str, required=True, help='Nexus URL')
+    parser.add_argument('--batch-size', type=int, default=500, help='Max events per Nexus batch')
+    parser.add_argument('--batch-bytes', type=int, default=512 * 1024, help='Max serialized bytes per Nexus batch')
+    parser.add_argument('--batch-age', type=float, default=2.0, help='Max seconds an event waits before its batch is flushed')
+    parser.add_argument('--state-dir', type=str, default='./state', help='Directory for the local ingest checkpoint')
+    parser.add_argument('--spool-dir', type=str, default='./state/spool', help='Directory for the on-disk event spool')
+    parser.add_argument('--spool-max-mb', type=int, default=512, help='Disk budget for the event spool before the oldest segments are evicted')
+    parser.add_argument('--coalesce-window', type=float, default=60, help='Seconds of Idle/Syncing/Pending status folded into one summary event, 0 to ship every status line')
+    parser.add_argument('--discovery-interval', type=float, default=30, help='Seconds between scans for new or removed subspace containers')
+    parser.add_argument('--worker-threads', type=int, default=8, help='Size of the thread pool shared by all monitored containers')
+    parser.add_argument('--history-size', type=int, default=86400, help='Rows of metric history kept in memory per container')
+    parser.add_argument('--api-port', type=int, default=9632, help='Port for the local history API and Prometheus /metrics, 0 to disable')
+    parser.add_argument('--api-host', type=str, default='127.0.0.1', help='Address the local API binds to; 0.0.0.0 exposes it to other hosts, e.g. a remote Prometheus')
+    parser.add_argument('--queue-size', type=int, default=10000, help='Capacity of each stream pipeline queue')
+    parser.add_argument('--sender-concurrency', type=int, default=2, help='Number of spool drainers posting to Nexus concurrently')
+    parser.add_argument('--instrument', action='store_true', help='Time each pipeline stage and log latency histograms every minute')
+    parser.add_argument('--docker-timestamps', action=argparse.BooleanOptionalAction, default=True, help="Read logs with docker's fixed-width timestamps and checkpoint on them")
+    parser.add_argument('--wire-format', choices=('json', 'compact'), default='json', help='Batch encoding posted to Nexus: JSON event objects, or gzipped record rows for a Nexus with /insert/events/compact')
+    parser.add_argument('--claim-summary-interval', type=float, default=300, help='Seconds between rolling claim summary events per container, 0 to disable')
+    parser.add_argument('--sync-progress-interval', type=float, default=60, help='Seconds between sync progress events while a node is behind or stalled, 0 to disable')
+    parser.add_argument('--stall-seconds', type=float, default=300, help='Seconds without best height progress before a node is reported as stalled')
+    parser.add_argument('--resource-cpu-threshold', type=float, default=5.0, help='Percentage points CPU usage must move before a container update is sent')
+    parser.add_argument('--resource-memory-threshold', type=float, default=2.0, help='Percentage points memory usage must move before a container update is sent')
+    parser.add_argument('--resource-min-interval', type=float, default=2, help='Fastest container resource polling, used while CPU or memory are moving')
+    parser.add_argument('--resource-max-interval', type=float, default=60, help='Slowest container resource polling, backed off to while usage is stable')
+    parser.add_argument('--nexus-connect-timeout', type=float, default=3.05, help='Seconds to wait for a connection to Nexus')
+    parser.add_argument('--nexus-read-timeout', type=float, default=30, help='Seconds to wait for Nexus to answer a request')
+    parser.add_argument('--nexus-gzip-bytes', type=int, default=16 * 1024, help='Request bodies at least this large are gzip-compressed')
+    parser.add_argument('--sinks', type=str, default='nexus', help='Comma separated event sinks: nexus (spooled and posted to Nexus), sqlite (local event store)')
+    parser.add_argument('--sqlite-path', type=str, default='./state/events.db', help='Database file for the sqlite sink')
+    parser.add_argument('--sqlite-retention-days', type=float, default=30, help='Days of events kept by the sqlite sink')
+    parser.add_argument('--backfill', type=str, help='Upload events from an exported log file (docker logs > file) instead of monitoring containers')
+    parser.add_argument('--container-name', type=str, help='Event source name for --backfill, i.e. the container the log came from')
+    parser.add_argument('--backfill-workers', type=int, default=None, help='Parser processes for --backfill, defaults to the CPU count')
 
     # Parse the arguments
     args = parser.parse_args()
 
+    NexusAPI.configure(
+        connect_timeout=args.nexus_connect_timeout,
+        read_timeout=args.nexus_read_timeout,
+        gzip_bytes=args.nexus_gzip_bytes
+    )
+
+    if args.backfill:
+        if not args.container_name:
+            parser.error('--backfill requires --container-name')
+
+        batcher = EventBatcher(args.nexus, max_count=args.batch_size, max_bytes=args.batch_bytes, wire_format=args.wire_format)
+        Backfill(args.backfill, args.container_name, batcher, args.coalesce_window, args.backfill_workers).run()
+        return
+
+    if not args.server and not args.docker_host:
+        parser.error('the following arguments are required: -s/--server or --docker-host')
+
+    labels = [spec.partition('=')[0] for spec in args.docker_host]
+    if any('=' not in spec for spec in args.docker_host) or len(set(labels)) != len(labels):
+        parser.error('--docker-host takes unique label=url pairs')
+
+    sinks = [sink.strip() for sink in args.sinks.split(',') if sink.strip()]
+    if not sinks or set(sinks) - {'nexus', 'sqlite'}:
+        parser.error('--sinks takes nexus, sqlite or both')
+
     # Access the arguments
     host_ip = args.server
     nexus_url = args.nexus
 
     config = {
         'Host IP': host_ip,
-        'Nexus URL': nexus_url
+        'Nexus URL': nexus_url,
+        'Docker Hosts': args.docker_host,
+        'Batch Size': args.batch_size,
+        'Batch Bytes': args.batch_bytes,
+        'Batch Age': args.batch_age,
+        'State Dir': args.state_dir,
+        'Spool Dir': args.spool_dir,
+        'Spool Max MB': args.spool_max_mb,
+        'Sinks': sinks,
+        'SQLite Path': args.sqlite_path,
+        'SQLite Retention Days': args.sqlite_retention_days,
+        'Coalesce Window': args.coalesce_window,
+        'Discovery Interval': args.discovery_interval,
+        'Worker Threads': args.worker_threads,
+        'History Size': args.history_size,
+        'API Port': args.api_port,
+        'API Host': args.api_host,
+        'Queue Size': args.queue_size,
+        'Sender Concurrency': args.sender_concurrency,
+        'Instrument': args.instrument,
+        'Wire Format': args.wire_format,
+        'Claim Summary Interval': args.claim_summary_interval,
+        'Sync Progress Interval': args.sync_progress_interval,
+        'Stall Seconds': args.stall_seconds,
+        'Docker Timestamps': args.docker_timestamps,
+        'Resource CPU Threshold': args.resource_cpu_threshold,
+        'Resource Memory Threshold': args.resource_memory_threshold,
+        'Resource Min Interval': args.resource_min_interval,
+        'Resource Max Interval': args.resource_max_interval
     }
         
     logger.info(f"Got Config: {config}")
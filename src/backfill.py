@@ -0,0 +1,138 @@
+import collections
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.logger import logger
+from src.log_classifier import LogClassifier
+from src.status_coalescer import StatusCoalescer
+
+CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def parse_chunk(path, start, end, name):
+    # Runs in a worker process: maps the file itself so only offsets cross the process boundary
+    events = []
+    lines = 0
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        position = start
+        while position < end:
+            newline = mm.find(b'\n', position, end)
+            if newline == -1:
+                newline = end
+
+            line = mm[position:newline].strip()
+            position = newline + 1
+            if not line:
+                continue
+
+            lines += 1
+            if not LogClassifier.interesting(line):
+                continue
+
+            event = LogClassifier.classify_line(line.decode('utf-8', errors='replace'), name)
+            if event:
+                events.append(event)
+
+    return lines, events
+
+
+class Backfill:
+    """
+    Replays an exported log file (`docker logs <container> > node.log`) into
+    Nexus. The file is memory-mapped and cut into line-aligned chunks that a
+    process pool parses with the same classifier as the live pipeline; results
+    are consumed in file order, optionally coalesced, and posted in bulk
+    batches. Only a few chunks are in flight at once, so multi-GB files do not
+    have to fit in memory.
+    """
+
+    def __init__(self, path, name, batcher, coalesce_window=0, workers=None, chunk_bytes=CHUNK_BYTES, max_backoff=60):
+        self.path = path
+        self.name = name
+        self.batcher = batcher
+        self.pending = batcher.accumulator()
+        self.coalescer = StatusCoalescer(coalesce_window) if coalesce_window else None
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_bytes = chunk_bytes
+        self.max_backoff = max_backoff
+
+        self.lines = 0
+        self.events = 0
+
+    def chunks(self):
+        # (start, end) byte ranges, each ending just after a newline or at EOF
+        size = os.path.getsize(self.path)
+        if not size:
+            return []
+
+        ranges = []
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = min(start + self.chunk_bytes, size)
+                if end < size:
+                    newline = mm.find(b'\n', end)
+                    end = size if newline == -1 else newline + 1
+
+                ranges.append((start, end))
+                start = end
+
+        return ranges
+
+    def run(self):
+        chunks = self.chunks()
+        logger.info(f"Backfilling {self.path} as {self.name}: {len(chunks)} chunks across {self.workers} processes")
+        started = time.monotonic()
+        shipped = self.batcher.shipped
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = collections.deque()
+
+            for start, end in chunks:
+                pending.append(executor.submit(parse_chunk, self.path, start, end, self.name))
+                if len(pending) >= self.workers * 2:
+                    self.consume(pending.popleft().result())
+
+            while pending:
+                self.consume(pending.popleft().result())
+
+        if self.coalescer:
+            self.batch(self.coalescer.flush())
+        self.upload(self.pending.take())
+
+        logger.info(
+            f"Backfill finished in {time.monotonic() - started:.1f}s: "
+            f"{self.lines} lines, {self.events} events parsed, {self.batcher.shipped - shipped} events accepted by Nexus"
+        )
+
+    def consume(self, result):
+        lines, events = result
+        self.lines += lines
+        self.events += len(events)
+
+        for event in events:
+            self.batch(self.coalescer.add(event) if self.coalescer else [event])
+
+    def batch(self, events):
+        for event in events:
+            if self.pending.add(event):
+                self.upload(self.pending.take())
+
+    def upload(self, events):
+        # Retries until Nexus takes the batch so history is rebuilt in order
+        if not events:
+            return
+
+        backoff = 1
+        while True:
+            # Only what Nexus hasn't taken yet is retried
+            events = events[self.batcher.send(events):]
+            if not events:
+                break
+
+            logger.warning(f"Retrying {len(events)} backfill events in {backoff}s")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
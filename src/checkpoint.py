@@ -0,0 +1,91 @@
+import calendar
+import json
+import os
+import re
+import time
+import zlib
+from datetime import datetime, timezone
+
+from src.logger import logger
+
+# The part of a line's leading timestamp that since() reads
+STAMP = re.compile(rb'\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d')
+
+
+class Checkpoint:
+    """
+    Durable ingest cursor for one container: the docker timestamp of the last
+    shipped log line plus a CRC32 of that line, so a resume can start from
+    the same second and skip exactly the lines that were already shipped.
+    """
+
+    def __init__(self, state_dir, name):
+        self.path = os.path.join(state_dir, f"{name}.json")
+        os.makedirs(state_dir, exist_ok=True)
+
+    @staticmethod
+    def cursor(line):
+        # line is the stripped raw log line (bytes)
+        return line.split(b' ', 1)[0].decode('utf-8', 'replace'), zlib.crc32(line)
+
+    @staticmethod
+    def stamped(line):
+        # Whether a cursor on this line could be resumed from, e.g. not a panic backtrace line
+        return STAMP.match(line.lstrip()) is not None
+
+    @staticmethod
+    def since(cursor):
+        # Whole epoch seconds; docker-py 7 can't subtract its naive epoch from an aware datetime
+        return calendar.timegm(time.strptime(cursor[0][:19], '%Y-%m-%dT%H:%M:%S'))
+
+    @staticmethod
+    def after(logs, cursor):
+        # Drop lines up to and including the cursor line, then pass the rest through
+        timestamp, digest = cursor
+        logs = iter(logs)
+
+        for log in logs:
+            line = log.strip()
+            stamp = line.split(b' ', 1)[0].decode('utf-8', 'replace')
+
+            if stamp < timestamp:
+                continue
+
+            if stamp == timestamp:
+                if zlib.crc32(line) == digest:
+                    break
+                continue
+
+            yield log
+            break
+
+        yield from logs
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+
+            return data['Timestamp'], data['Hash']
+
+        except FileNotFoundError:
+            return None
+
+        except Exception as e:
+            logger.error(f"Unable to read checkpoint {self.path}:", exc_info=e)
+            return None
+
+    def save(self, cursor):
+        data = {
+            'Timestamp': cursor[0],
+            'Hash': cursor[1],
+            'Updated At': datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, self.path)
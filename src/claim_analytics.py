@@ -0,0 +1,177 @@
+import collections
+import math
+import threading
+
+import src.constants as constants
+from src.event_record import ClaimRecord
+from src.utils import Utils
+
+CLAIM_TYPES = ('Vote', 'Block')
+
+# Window label -> (span seconds, bucket count)
+WINDOWS = {
+    '1h': (3600, 60),
+    '24h': (86400, 96),
+    '7d': (7 * 86400, 168),
+}
+
+# Window whose rate is taken as the expected rate for the shorter ones
+BASELINE = '7d'
+
+
+class RollingCounter:
+    """
+    Claims per type over a sliding span, kept as a deque of fixed-width
+    buckets with running totals. Adding a claim touches the newest bucket and
+    expiry pops whole buckets off the front, so both are O(1) amortized and
+    memory is bounded by the bucket count.
+    """
+
+    def __init__(self, span, buckets):
+        self.span = span
+        self.buckets = buckets
+        self.width = span / buckets
+        self.deque = collections.deque()
+        self.totals = dict.fromkeys(CLAIM_TYPES, 0)
+
+    def add(self, epoch, claim_type):
+        # Log time drives expiry too, so a counter nobody reads stays bounded
+        self.expire(epoch)
+        index = int(epoch // self.width)
+
+        # Claims arrive in log order; a late one is counted in the newest bucket
+        if not self.deque or index > self.deque[-1][0]:
+            self.deque.append([index, dict.fromkeys(CLAIM_TYPES, 0)])
+
+        self.deque[-1][1][claim_type] += 1
+        self.totals[claim_type] += 1
+
+    def expire(self, now):
+        oldest = int(now // self.width) - self.buckets
+        while self.deque and self.deque[0][0] <= oldest:
+            _, counts = self.deque.popleft()
+            for claim_type, count in counts.items():
+                self.totals[claim_type] -= count
+
+
+class GapStats:
+    # Slots between consecutive wins of one type, with Welford's running mean/variance
+    def __init__(self):
+        self.last_slot = None
+        self.last_gap = None
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, slot):
+        if self.last_slot is not None and slot > self.last_slot:
+            gap = slot - self.last_slot
+            self.last_gap = gap
+            self.count += 1
+            delta = gap - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (gap - self.mean)
+            self.min = gap if self.min is None else min(self.min, gap)
+            self.max = gap if self.max is None else max(self.max, gap)
+
+        self.last_slot = slot
+
+    def summary(self):
+        return {
+            'Last Slot': self.last_slot,
+            'Last Gap': self.last_gap,
+            'Gaps': self.count,
+            'Mean Gap': round(self.mean, 1) if self.count else None,
+            'Stdev Gap': round(math.sqrt(self.m2 / self.count), 1) if self.count else None,
+            'Min Gap': self.min,
+            'Max Gap': self.max,
+        }
+
+
+class ClaimAnalytics:
+    """
+    Incremental claim statistics for one container: rolling vote/block
+    counts over 1h/24h/7d, slot gaps between wins, and each short window's
+    count against what the 7d rate predicts for it. Fed with every parsed
+    event as a pipeline observer; windows are timed on the log timestamps so
+    a catch-up replay lands in the right buckets. summary() is what gets
+    shipped as a periodic 'Claim Summary' event.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.windows = {label: RollingCounter(span, buckets) for label, (span, buckets) in WINDOWS.items()}
+        self.gaps = {claim_type: GapStats() for claim_type in CLAIM_TYPES}
+        self.first_epoch = None
+        self.claims = 0
+
+    def observe(self, event):
+        if not isinstance(event, ClaimRecord):
+            return
+
+        with self.lock:
+            if self.first_epoch is None:
+                self.first_epoch = event.epoch
+
+            self.claims += 1
+            for window in self.windows.values():
+                window.add(event.epoch, event.claim_type)
+            self.gaps[event.claim_type].add(event.slot)
+
+    def covered(self, label, now):
+        # Seconds of the window that claims could have been seen in
+        return max(0, min(WINDOWS[label][0], now - self.first_epoch))
+
+    def windows_summary(self, now):
+        with self.lock:
+            if self.first_epoch is None:
+                return {}
+
+            for window in self.windows.values():
+                window.expire(now)
+
+            totals = {label: dict(window.totals) for label, window in self.windows.items()}
+            covered = {label: self.covered(label, now) for label in WINDOWS}
+
+        summary = {}
+        for label, counts in totals.items():
+            hours = covered[label] / 3600
+            window = {}
+
+            for claim_type in CLAIM_TYPES:
+                window[f"{claim_type}s"] = counts[claim_type]
+                window[f"{claim_type}s Per Hour"] = round(counts[claim_type] / hours, 3) if hours else None
+
+                if label != BASELINE and covered[BASELINE]:
+                    expected = totals[BASELINE][claim_type] / covered[BASELINE] * covered[label]
+                    window[f"Expected {claim_type}s"] = round(expected, 2)
+                    window[f"{claim_type} Ratio"] = round(counts[claim_type] / expected, 3) if expected else None
+
+            summary[label] = window
+
+        return summary
+
+    def summary(self, now):
+        windows = self.windows_summary(now)
+        if not windows:
+            return None
+
+        with self.lock:
+            gaps = {claim_type: stats.summary() for claim_type, stats in self.gaps.items()}
+            claims = self.claims
+
+        return {
+            'Event Name': 'Claim Summary',
+            'Event Type': constants.ANALYTICS_EVENT_TYPE,
+            'Event Level': 'INFO',
+            'Event Datetime': Utils.format_epoch(int(now)),
+            'Event Source': self.name,
+            'Event Data': {
+                'Claims': claims,
+                'Windows': windows,
+                'Slot Gaps': gaps,
+            }
+        }
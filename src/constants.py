@@ -1,4 +1,14 @@
 VERSIONS = {
     'Spaceport Node': 'v0.0.1',
     'Image': 'gemini-3h-2024-may-15'
-}
\ No newline at end of file
+}
+
+# Image tag fragment -> Container Type
+CONTAINER_IMAGES = {
+    'subspace/node': 'Node',
+    'subspace/farmer': 'Farmer'
+}
+# Event Type of events derived from the log rather than parsed from it. Not
+# 'Node': they are stamped with wall time, and Nexus' latest Node event is
+# where a pipeline without a checkpoint resumes reading the log
+ANALYTICS_EVENT_TYPE = 'Analytics'
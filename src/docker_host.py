@@ -0,0 +1,66 @@
+import os
+import threading
+from urllib.parse import urlparse
+
+import docker
+
+from src.container_monitor import ContainerMonitor
+from src.logger import logger
+
+
+class DockerHost:
+    """
+    One docker daemon the node monitors: its client, host info and the
+    directory its containers' checkpoints live in. In fleet mode the node
+    holds one of these per endpoint, e.g. tcp://10.0.0.5:2375 or
+    unix:///var/run/docker.sock; otherwise a single one built from the
+    environment. The client is created on first connect() so an unreachable
+    daemon is retried by discovery instead of failing startup.
+    """
+
+    def __init__(self, label, url=None, ip=None, state_dir='./state'):
+        self.label = label
+        self.url = url
+        self.ip = ip
+        self.state_dir = state_dir
+        self.client = None
+        self.info = None
+        # Whether the most recent discovery or events call reached the daemon
+        self.connected = False
+        # Discovery runs on a timer and on docker events; one pass per host at a time
+        self.sync_lock = threading.Lock()
+
+    @staticmethod
+    def parse(spec, default_ip, state_dir):
+        # 'label=url', with the server IP taken from a tcp URL's host
+        label, _, url = spec.partition('=')
+        if not label or not url:
+            raise ValueError(f"Docker host must look like label=url, got {spec!r}")
+
+        parsed = urlparse(url)
+        ip = parsed.hostname if parsed.scheme in ('tcp', 'http', 'https') else default_ip
+        return DockerHost(label, url, ip, os.path.join(state_dir, label))
+
+    def connect(self):
+        if self.client is None:
+            try:
+                self.client = docker.DockerClient(base_url=self.url) if self.url else docker.from_env()
+            except Exception as e:
+                logger.error(f"Error connecting to docker host {self.label}:", exc_info=e)
+                self.connected = False
+                return False
+
+        if self.info is None:
+            self.refresh_info()
+
+        return self.info is not None
+
+    def refresh_info(self):
+        try:
+            self.info = ContainerMonitor.get_host_info(self.client, self.ip)
+            self.connected = True
+        except Exception as e:
+            logger.error(f"Error reading host info from docker host {self.label}:", exc_info=e)
+            self.connected = False
+
+        return self.info
@@ -0,0 +1,135 @@
+import threading
+import time
+
+from src.event_record import Records
+from src.logger import logger
+from src.nexus_api import NexusAPI, NexusUnavailable
+
+
+class EventBatch:
+    """
+    Events collected by one producer until the batch is full or old enough
+    to take. Sending is EventBatcher's; this only decides when to cut.
+    """
+
+    def __init__(self, max_count=500, max_bytes=512 * 1024, max_age=2.0, wire_format='json'):
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        # Sizes are estimated in the format the batch will be posted in
+        self.wire_format = wire_format
+
+        self.events = []
+        self.size = 0
+        self.first_at = None
+
+    def add(self, event):
+        # Returns True once the batch is full and should be taken
+        if not self.events:
+            self.first_at = time.monotonic()
+
+        self.events.append(event)
+        self.size += Records.size(event, self.wire_format)
+
+        return len(self.events) >= self.max_count or self.size >= self.max_bytes
+
+    def time_left(self):
+        # Seconds until the batch hits max_age, None when it is empty
+        if not self.events:
+            return None
+
+        return max(0.0, self.max_age - (time.monotonic() - self.first_at))
+
+    def take(self):
+        events = self.events
+        self.events = []
+        self.size = 0
+        self.first_at = None
+
+        return events
+
+
+class EventBatcher:
+    def __init__(self, nexus_url, max_count=500, max_bytes=512 * 1024, max_age=2.0, on_sent=None, wire_format='json'):
+        self.nexus_url = nexus_url
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.on_sent = on_sent
+        # 'json' posts Nexus-shaped event objects, 'compact' posts gzipped
+        # record rows to /insert/events/compact
+        self.wire_format = wire_format
+
+        # None until the first bulk post tells us whether Nexus has /insert/events
+        self.bulk_supported = None
+
+        self.lock = threading.Lock()
+        self.shipped = 0
+
+    def accumulator(self):
+        # A batch with these limits for one producer to fill and take from,
+        # so a batch only ever holds that producer's events
+        return EventBatch(self.max_count, self.max_bytes, self.max_age, self.wire_format)
+
+    def send(self, events):
+        # Returns how many leading events are done with: all of them once sent,
+        # or when Nexus rejects them outright (logged and dropped), fewer when
+        # Nexus became unavailable and the rest should be retried.
+        done = 0
+        try:
+            if self.wire_format == 'compact':
+                created = NexusAPI.create_events_compact(self.nexus_url, Records.encode_batch(events), retry=False)
+
+                if created is None:
+                    logger.warning("Nexus has no compact insert endpoint, falling back to JSON events")
+                    self.wire_format = 'json'
+
+                else:
+                    if not created:
+                        logger.error(f"Nexus rejected compact batch of {len(events)} events")
+                        return len(events)
+
+                    self.sent(events)
+                    return len(events)
+
+            # Records only take the Nexus JSON shape here, on their way out
+            payload = [Records.to_event(event) for event in events]
+
+            if self.bulk_supported is not False:
+                created = NexusAPI.create_events(self.nexus_url, payload, retry=False)
+
+                if created is None:
+                    logger.warning("Nexus has no bulk insert endpoint, falling back to per-event posts")
+                    self.bulk_supported = False
+
+                else:
+                    self.bulk_supported = True
+                    if not created:
+                        logger.error(f"Nexus rejected batch of {len(events)} events")
+                        return len(events)
+
+                    self.sent(events)
+                    return len(events)
+
+            for event, body in zip(events, payload):
+                if NexusAPI.create_event(self.nexus_url, body, retry=False):
+                    self.sent([event])
+                done += 1
+
+            return done
+
+        except NexusUnavailable as e:
+            logger.warning(f"Nexus unavailable, {len(events) - done} of {len(events)} events not sent: {e}")
+            return done
+
+        except Exception as e:
+            logger.error("Error sending event batch:", exc_info=e)
+            return len(events)
+
+    def sent(self, events):
+        with self.lock:
+            self.shipped += len(events)
+
+        if self.on_sent:
+            for event in events:
+                self.on_sent(event)
@@ -0,0 +1,166 @@
+import gzip
+import json
+
+from src.utils import Utils
+
+
+class EventRecord:
+    """
+    Compact, fixed-field form of a node event. Records are what the parser
+    produces and what the pipeline, spool and observers pass around; the
+    nested Nexus dict ('Event Name', 'Event Data': {...}) is only built by
+    to_event() when a batch is sent. Container events stay plain dicts, and
+    every helper here accepts either.
+    """
+
+    __slots__ = ('name', 'level', 'epoch', 'source')
+
+    # Row tag identifying the record class in the spool and the compact wire format
+    kind = None
+
+    @property
+    def datetime(self):
+        return Utils.format_epoch(self.epoch)
+
+    def header(self):
+        return {
+            'Event Name': self.name,
+            'Event Type': 'Node',
+            'Event Level': self.level,
+            'Event Datetime': self.datetime,
+            'Event Source': self.source,
+        }
+
+    def row(self):
+        return [self.kind] + [getattr(self, field) for field in self.fields]
+
+    @classmethod
+    def from_row(cls, row):
+        record = cls.__new__(cls)
+        for field, value in zip(cls.fields, row[1:]):
+            setattr(record, field, value)
+        return record
+
+
+class StatusRecord(EventRecord):
+    # Idle/Preparing/Syncing/Pending; speeds are bytes/sec. `window` is None for a
+    # single status line and a tuple of WINDOW_FIELDS for a coalesced summary.
+    __slots__ = ('peers', 'best', 'target', 'finalized', 'bps', 'down', 'up', 'window')
+
+    kind = 'S'
+    fields = EventRecord.__slots__ + __slots__
+
+    WINDOW_FIELDS = ('Min Peers', 'Max Peers', 'Avg Peers', 'First Best', 'First Finalized', 'Samples', 'Window Start', 'Window End')
+
+    def __init__(self, name, level, epoch, source, peers, best, target, finalized, bps, down, up, window=None):
+        self.name = name
+        self.level = level
+        self.epoch = epoch
+        self.source = source
+        self.peers = peers
+        self.best = best
+        self.target = target
+        self.finalized = finalized
+        self.bps = bps
+        self.down = down
+        self.up = up
+        self.window = window
+
+    def to_event(self):
+        data = {
+            'Status': self.name,
+            'Peers': self.peers,
+            'Best': self.best,
+            'Target': self.target,
+            'Finalized': self.finalized,
+            'BPS': self.bps,
+            'Down Speed': self.down,
+            'Up Speed': self.up,
+            'Down Unit': 'B/s',
+            'Up Unit': 'B/s'
+        }
+
+        if self.window:
+            data.update(zip(StatusRecord.WINDOW_FIELDS[:6], self.window[:6]))
+            data['Window Start'] = Utils.format_epoch(self.window[6])
+            data['Window End'] = Utils.format_epoch(self.window[7])
+
+        return {**self.header(), 'Event Data': data}
+
+
+class ClaimRecord(EventRecord):
+    __slots__ = ('slot', 'claim_type')
+
+    kind = 'C'
+    fields = EventRecord.__slots__ + __slots__
+
+    def __init__(self, name, level, epoch, source, slot, claim_type):
+        self.name = name
+        self.level = level
+        self.epoch = epoch
+        self.source = source
+        self.slot = slot
+        self.claim_type = claim_type
+
+    def to_event(self):
+        return {**self.header(), 'Event Data': {'Slot': self.slot, 'Claim Type': self.claim_type}}
+
+
+RECORD_KINDS = {cls.kind: cls for cls in (StatusRecord, ClaimRecord)}
+
+# Field order of each row kind, sent with every compact batch so Nexus can decode it
+WIRE_SCHEMA = {kind: list(cls.fields) for kind, cls in RECORD_KINDS.items()}
+
+
+def _json_overhead(record):
+    # Extra bytes the Nexus object form of a record costs over its row form
+    return len(json.dumps(record.to_event(), ensure_ascii=False)) - len(json.dumps(record.row(), ensure_ascii=False))
+
+
+# Key text is the same for every record of a kind, so the JSON size of a record
+# is its row size plus a constant, without building the dict. Samples use a
+# 10-digit epoch like any real timestamp; a status name is repeated in 'Status'.
+EPOCH = 10 ** 9
+JSON_OVERHEAD = {
+    'S': _json_overhead(StatusRecord('', 'INFO', EPOCH, '', 0, 0, None, 0, None, 0, 0)),
+    'C': _json_overhead(ClaimRecord('Claim', 'INFO', EPOCH, '', 0, 'Vote')),
+}
+JSON_OVERHEAD['W'] = _json_overhead(StatusRecord('', 'INFO', EPOCH, '', 0, 0, None, 0, None, 0, 0, (0, 0, 0, 0, 0, 0, EPOCH, EPOCH))) - JSON_OVERHEAD['S']
+
+
+class Records:
+    @staticmethod
+    def to_event(event):
+        # Nexus JSON shape of a record; dict events pass through
+        return event.to_event() if isinstance(event, EventRecord) else event
+
+    @staticmethod
+    def epoch(event):
+        return event.epoch if isinstance(event, EventRecord) else Utils.to_epoch(event['Event Datetime'])
+
+    @staticmethod
+    def encode(event):
+        # One spool/wire item: a JSON array for records, the full object otherwise
+        return json.dumps(event.row() if isinstance(event, EventRecord) else event, default=str, ensure_ascii=False)
+
+    @staticmethod
+    def decode(item):
+        if isinstance(item, list):
+            return RECORD_KINDS[item[0]].from_row(item)
+        return item
+
+    @staticmethod
+    def size(event, wire_format='json'):
+        # Bytes the event adds to a batch body in the given wire format
+        size = len(Records.encode(event))
+        if wire_format == 'json' and isinstance(event, EventRecord):
+            size += JSON_OVERHEAD[event.kind]
+            if event.kind == 'S':
+                size += len(event.name) + (JSON_OVERHEAD['W'] if event.window else 0)
+        return size
+
+    @staticmethod
+    def encode_batch(events):
+        # Compact wire body: gzipped {"schema": ..., "events": [row or object, ...]}
+        body = '{"schema":' + json.dumps(WIRE_SCHEMA) + ',"events":[' + ','.join(Records.encode(event) for event in events) + ']}'
+        return gzip.compress(body.encode('utf-8'))
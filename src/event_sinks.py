@@ -0,0 +1,172 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.event_record import Records
+from src.logger import logger
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    epoch INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT,
+    level TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_source_name_epoch ON events (source, name, epoch);
+CREATE INDEX IF NOT EXISTS events_epoch ON events (epoch);
+"""
+
+
+class EventSink:
+    """
+    Somewhere events go once they leave the pipeline. append() takes a batch
+    of records and/or event dicts and returns once the batch is durable in
+    the sink, raising if it isn't. The EventSpool is the Nexus sink: it
+    persists the batch and its drainers post it through NexusAPI.
+    """
+
+    def append(self, events):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class FanoutSink(EventSink):
+    # Every batch goes to every sink; one failing sink doesn't keep the batch from the others
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def append(self, events):
+        error = None
+        for sink in self.sinks:
+            try:
+                sink.append(events)
+            except Exception as e:
+                logger.error(f"Error writing to {type(sink).__name__}:", exc_info=e)
+                error = error or e
+
+        if error:
+            raise error
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+class SQLiteSink(EventSink):
+    """
+    Local event history in SQLite, so the host keeps its events when Nexus
+    is unreachable and can answer queries like "claims in the last 24h"
+    from an index. The database runs in WAL mode, each batch is one
+    executemany transaction, and prune() drops events older than the
+    retention period and hands freed pages back to the filesystem.
+    """
+
+    def __init__(self, path, retention_days=30):
+        self.path = path
+        self.retention = retention_days * 86400
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        # auto_vacuum only takes effect before the first table is created
+        self.db.execute('PRAGMA auto_vacuum=INCREMENTAL')
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.executescript(SQLITE_SCHEMA)
+
+    @staticmethod
+    def row(event):
+        event = Records.to_event(event)
+        return (
+            Records.epoch(event),
+            event['Event Source'],
+            event['Event Name'],
+            event.get('Event Type'),
+            event.get('Event Level'),
+            json.dumps(event['Event Data'], default=str)
+        )
+
+    def append(self, events):
+        rows = [SQLiteSink.row(event) for event in events]
+
+        with self.lock, self.db:
+            self.db.executemany(
+                'INSERT INTO events (epoch, source, name, type, level, data) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    @staticmethod
+    def where(source, name, since, until):
+        clauses, params = [], []
+        for clause, value in (('source = ?', source), ('name = ?', name), ('epoch >= ?', since), ('epoch <= ?', until)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def query(self, source=None, name=None, since=None, until=None, limit=1000):
+        # Newest first, in the Nexus event shape
+        where, params = SQLiteSink.where(source, name, since, until)
+
+        with self.lock:
+            rows = self.db.execute(
+                f'SELECT epoch, source, name, type, level, data FROM events{where} ORDER BY epoch DESC LIMIT ?',
+                params + [limit]
+            ).fetchall()
+
+        return [
+            {
+                'Event Name': row['name'],
+                'Event Type': row['type'],
+                'Event Level': row['level'],
+                'Event Datetime': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(row['epoch'])),
+                'Event Source': row['source'],
+                'Event Data': json.loads(row['data']),
+            }
+            for row in rows
+        ]
+
+    def count(self, source=None, name=None, since=None, until=None):
+        where, params = SQLiteSink.where(source, name, since, until)
+
+        with self.lock:
+            return self.db.execute(f'SELECT COUNT(*) FROM events{where}', params).fetchone()[0]
+
+    def prune(self, now=None):
+        cutoff = (now or time.time()) - self.retention
+
+        with self.lock:
+            with self.db:
+                deleted = self.db.execute('DELETE FROM events WHERE epoch < ?', (cutoff,)).rowcount
+
+            if deleted:
+                # execute() steps the pragma once, which frees a single page;
+                # executescript() runs it until the freelist is empty
+                self.db.executescript('PRAGMA incremental_vacuum;')
+                self.db.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+        return deleted
+
+    def run_retention(self, stop_event, interval=3600):
+        while not stop_event.is_set():
+            try:
+                deleted = self.prune()
+                if deleted:
+                    logger.info(f"Pruned {deleted} events older than {self.retention // 86400} days from {self.path}")
+            except Exception as e:
+                logger.error("Error pruning local event store:", exc_info=e)
+
+            stop_event.wait(interval)
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,225 @@
+import json
+import os
+import threading
+
+from src.event_record import Records
+from src.event_sinks import EventSink
+from src.logger import logger
+
+SEGMENT_PREFIX = 'segment-'
+SEGMENT_SUFFIX = '.jsonl'
+
+
+class EventSpool(EventSink):
+    """
+    Append-only, segment-based write-ahead log sitting between the stream
+    pipeline and Nexus. Events are fsynced to the active segment first;
+    drainer threads replay sealed segments to Nexus and delete them once
+    every event in them has been delivered. When the spool outgrows its disk
+    budget the oldest segments not being drained are evicted.
+    """
+
+    def __init__(self, spool_dir, segment_bytes=4 * 1024 * 1024, max_bytes=512 * 1024 * 1024, max_backoff=60):
+        self.spool_dir = spool_dir
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.max_backoff = max_backoff
+
+        self.lock = threading.Lock()
+        self.claimed = set()
+        self.evicted_segments = 0
+        self.evicted_bytes = 0
+
+        os.makedirs(spool_dir, exist_ok=True)
+
+        # Anything left over from a previous run is sealed and drained first
+        self.sizes = {path: os.path.getsize(path) for path in self.segments()}
+        self.next_seq = max([self.seq(path) for path in self.sizes], default=0) + 1
+        self.active = None
+        self.active_path = None
+        self.open_segment()
+
+    @staticmethod
+    def seq(path):
+        return int(os.path.basename(path)[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+
+    def segments(self):
+        names = [
+            name for name in os.listdir(self.spool_dir)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)
+        ]
+        return sorted(os.path.join(self.spool_dir, name) for name in names)
+
+    def open_segment(self):
+        self.active_path = os.path.join(self.spool_dir, f"{SEGMENT_PREFIX}{self.next_seq:012d}{SEGMENT_SUFFIX}")
+        self.next_seq += 1
+        self.active = open(self.active_path, 'ab')
+        self.sizes[self.active_path] = 0
+
+    def seal(self):
+        self.active.close()
+        self.open_segment()
+
+    def append(self, events):
+        data = b''.join(Records.encode(event).encode('utf-8') + b'\n' for event in events)
+
+        with self.lock:
+            self.active.write(data)
+            self.active.flush()
+            os.fsync(self.active.fileno())
+            self.sizes[self.active_path] += len(data)
+
+            if self.sizes[self.active_path] >= self.segment_bytes:
+                self.seal()
+
+            self.evict()
+
+    def evict(self):
+        total = sum(self.sizes.values())
+
+        for path in sorted(self.sizes):
+            if total <= self.max_bytes:
+                break
+
+            if path == self.active_path or path in self.claimed:
+                continue
+
+            size = self.sizes.pop(path)
+            total -= size
+            self.remove(path)
+            self.evicted_segments += 1
+            self.evicted_bytes += size
+            logger.warning(f"Spool over budget, evicted {os.path.basename(path)} ({size} bytes)")
+
+    def claim(self):
+        # Oldest unclaimed segment; the active one is sealed when it is all that's left
+        with self.lock:
+            for path in sorted(self.sizes):
+                if path in self.claimed:
+                    continue
+
+                if path == self.active_path:
+                    if not self.sizes[path]:
+                        return None
+                    self.seal()
+
+                self.claimed.add(path)
+                return path
+
+            return None
+
+    def release(self, path, done):
+        with self.lock:
+            self.claimed.discard(path)
+            if done:
+                self.sizes.pop(path, None)
+                self.remove(path)
+
+    def remove(self, path):
+        for target in (path, f"{path}.offset"):
+            try:
+                os.remove(target)
+            except FileNotFoundError:
+                pass
+
+    def pending_bytes(self):
+        with self.lock:
+            return sum(self.sizes.values())
+
+    def stats(self):
+        with self.lock:
+            return {
+                'Segments': len(self.sizes),
+                'Pending Bytes': sum(self.sizes.values()),
+                'Draining': len(self.claimed),
+                'Evicted Segments': self.evicted_segments,
+                'Evicted Bytes': self.evicted_bytes,
+            }
+
+    @staticmethod
+    def read_offset(path):
+        try:
+            with open(f"{path}.offset") as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def write_offset(path, offset):
+        tmp_path = f"{path}.offset.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(str(offset))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, f"{path}.offset")
+
+    @staticmethod
+    def decode(lines):
+        # Events plus, for each, how many lines up to and including it were consumed
+        events, ends = [], []
+        for index, line in enumerate(lines):
+            try:
+                events.append(Records.decode(json.loads(line)))
+                ends.append(index + 1)
+            except (ValueError, KeyError):
+                # A torn write from a crash mid-append
+                logger.warning(f"Skipping unreadable spool record: {line[:80]}")
+        return events, ends
+
+    def drain_segment(self, path, send, batch_size, stop_event):
+        # Returns True once every event in the segment has been delivered
+        try:
+            with open(path, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            # Evicted between claim and read
+            return True
+
+        offset = self.read_offset(path)
+        backoff = 1
+
+        while offset < len(lines):
+            if stop_event.is_set():
+                return False
+
+            chunk = lines[offset:offset + batch_size]
+            events, ends = self.decode(chunk)
+
+            # send() reports how many leading events are done, so a partly
+            # delivered chunk resumes after the last one instead of resending it
+            sent = send(events) if events else 0
+            if not events or sent == len(events):
+                offset += len(chunk)
+                self.write_offset(path, offset)
+                backoff = 1
+                continue
+
+            if sent:
+                offset += ends[sent - 1]
+                self.write_offset(path, offset)
+
+            logger.warning(f"Spool drain paused, retrying in {backoff}s")
+            stop_event.wait(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+        return True
+
+    def drain(self, send, batch_size, stop_event, poll_interval=1.0):
+        while not stop_event.is_set():
+            path = self.claim()
+            if not path:
+                stop_event.wait(poll_interval)
+                continue
+
+            done = False
+            try:
+                done = self.drain_segment(path, send, batch_size, stop_event)
+            except Exception as e:
+                logger.error(f"Error draining spool segment {path}:", exc_info=e)
+                stop_event.wait(poll_interval)
+            finally:
+                self.release(path, done)
+
+    def close(self):
+        with self.lock:
+            self.active.close()
@@ -0,0 +1,114 @@
+import bisect
+import threading
+import time
+
+from src.event_record import Records
+
+# Histogram bucket upper bounds in seconds: 1us doubling up to ~2.3 hours
+BUCKETS = [1e-6 * 2 ** i for i in range(34)]
+
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def record(self, elapsed):
+        index = bisect.bisect_left(BUCKETS, elapsed)
+        with self.lock:
+            self.count += 1
+            self.total += elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+            self.buckets[index] += 1
+
+    def error(self):
+        with self.lock:
+            self.errors += 1
+
+    def quantile(self, buckets, count, q):
+        # Upper bound of the bucket holding the q-th observation
+        target = q * count
+        seen = 0
+        for index, hits in enumerate(buckets):
+            seen += hits
+            if seen >= target:
+                return BUCKETS[index] if index < len(BUCKETS) else self.max
+        return self.max
+
+    def snapshot(self, elapsed):
+        with self.lock:
+            count, errors, total, longest, buckets = self.count, self.errors, self.total, self.max, list(self.buckets)
+
+        return {
+            'Count': count,
+            'Errors': errors,
+            'Per Second': round(count / elapsed, 1) if elapsed else None,
+            'Mean ms': round(total / count * 1000, 3) if count else None,
+            'P50 ms': round(self.quantile(buckets, count, 0.5) * 1000, 3) if count else None,
+            'P99 ms': round(self.quantile(buckets, count, 0.99) * 1000, 3) if count else None,
+            'Max ms': round(longest * 1000, 3) if count else None,
+        }
+
+
+class Instrumentation:
+    """
+    Counters and latency histograms for each stage of the stream pipeline
+    (read, enqueue, decode, parse, spool, nexus) plus the lag between a log
+    line's timestamp and Nexus acknowledging it. When disabled, callers
+    check `enabled` once and skip timing entirely, so the hot path pays for
+    a single attribute read.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.monotonic()
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def stage(self, name):
+        with self.lock:
+            if name not in self.stages:
+                self.stages[name] = StageStats(name)
+            return self.stages[name]
+
+    def timed(self, name, func):
+        # Wraps func so each call is recorded under the named stage
+        if not self.enabled:
+            return func
+
+        stats = self.stage(name)
+
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                stats.error()
+                raise
+            finally:
+                stats.record(time.perf_counter() - started)
+
+        return wrapper
+
+    def record_lag(self, event):
+        # Seconds between the log line and now, for the newest event Nexus acknowledged
+        logged_at = Records.epoch(event)
+        self.stage('lag').record(max(0.0, time.time() - logged_at))
+
+    def snapshot(self):
+        elapsed = time.monotonic() - self.started
+
+        with self.lock:
+            stages = dict(self.stages)
+
+        return {
+            'Enabled': self.enabled,
+            'Uptime Seconds': round(elapsed),
+            'Stages': {name: stats.snapshot(elapsed) for name, stats in stages.items()},
+        }
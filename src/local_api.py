@@ -0,0 +1,93 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.logger import logger
+
+
+class LocalAPI:
+    """
+    Small read-only HTTP endpoint on the node host. Routes map a path to a
+    handler taking the parsed query string and returning (status, content
+    type, body).
+    """
+
+    def __init__(self, port, buffers, host='127.0.0.1'):
+        # buffers: callable returning {container name: MetricsBuffer}
+        self.port = port
+        self.host = host
+        self.buffers = buffers
+        self.routes = {
+            '/containers': self.get_containers,
+            '/history': self.get_history,
+        }
+        self.server = None
+
+    def add_route(self, path, handler):
+        self.routes[path] = handler
+
+    @staticmethod
+    def json_response(data, status=200):
+        return status, 'application/json', json.dumps(data).encode('utf-8')
+
+    def get_containers(self, query):
+        return LocalAPI.json_response(sorted(self.buffers()))
+
+    def get_history(self, query):
+        name = query.get('container', [None])[0]
+        buffer = self.buffers().get(name)
+        if not buffer:
+            return LocalAPI.json_response({'message': f"Unknown container: {name}"}, 404)
+
+        try:
+            start = float(query['start'][0]) if 'start' in query else None
+            end = float(query['end'][0]) if 'end' in query else None
+            step = float(query['step'][0]) if 'step' in query else None
+        except ValueError:
+            return LocalAPI.json_response({'message': 'start, end and step must be numbers'}, 400)
+
+        return LocalAPI.json_response({'container': name, 'data': buffer.query(start, end, step)})
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                route = api.routes.get(url.path)
+
+                try:
+                    if route:
+                        status, content_type, body = route(parse_qs(url.query))
+                    else:
+                        status, content_type, body = LocalAPI.json_response({'message': 'Not found'}, 404)
+                except Exception as e:
+                    logger.error(f"Error serving {self.path}:", exc_info=e)
+                    status, content_type, body = LocalAPI.json_response({'message': 'Internal error'}, 500)
+
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def run(self, stop_event):
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), self.handler())
+        except OSError as e:
+            # e.g. the port is taken; the node keeps running without the API
+            logger.error(f"Local API could not bind {self.host}:{self.port}, pick another with --api-port: {e}")
+            return
+
+        self.server.daemon_threads = True
+        logger.info(f"Local API listening on {self.host}:{self.port}")
+
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        stop_event.wait()
+        self.server.shutdown()
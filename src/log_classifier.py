@@ -0,0 +1,157 @@
+import itertools
+import re
+
+from src.event_record import ClaimRecord, StatusRecord
+from src.logger import logger
+from src.utils import Utils, LOG_PATTERN
+
+# Compiled once at import. Every log line goes through exactly one search of the
+# discriminator and, when it hits, exactly one anchored match of the pattern for
+# that event kind.
+DISCRIMINATOR = re.compile(r'Idle|Preparing|Syncing|Pending|Claimed')
+
+IDLE_PATTERN = re.compile(
+    r'Idle \((?P<peers>\d+) peers\), best: #(?P<best>\d+).*finalized #(?P<finalized>\d+).*⬇ (?P<down_speed>\d+(?:\.\d+)?)(?P<down_unit>\s?[kKMmGg]?[iI]?[bB]/s) ⬆ (?P<up_speed>\d+(?:\.\d+)?)(?P<up_unit>\s?[kKMmGg]?[iI]?[bB]/s)'
+)
+
+PREPARING_PATTERN = re.compile(
+    r'Preparing(?:\s+(?P<bps>\d+\.\d+)\s+bps)?[^,]*,\s*'  # Optional bps
+    r'target=#(?P<target>\d+)\s+\((?P<peers>\d+)\s+peers\),\s+'  # target and peers
+    r'best:\s+#(?P<best>\d+)\s+\([^)]*\),\s+'  # best
+    r'finalized\s+#(?P<finalized>\d+)\s+\([^)]*\),\s+'  # finalized
+    r'⬇\s+(?P<down_speed>\d+(?:\.\d+)?)(?P<down_unit>kiB|MiB)/s\s+'  # download speed and unit
+    r'⬆\s+(?P<up_speed>\d+(?:\.\d+)?)(?P<up_unit>kiB|MiB)/s'  # upload speed and unit
+)
+
+SYNCING_PATTERN = re.compile(
+    r'Syncing(?:\s+(?P<bps>\d+\.\d+) bps)?, target=#(?P<target>\d+) \((?P<peers>\d+) peers\), best: #(?P<best>\d+) \([^\)]+\), finalized #(?P<finalized>\d+) \([^\)]+\), ⬇ (?P<down_speed>\d+\.\d+)(?P<down_unit>[kKmMgG][iI]?[bB]/s) ⬆ (?P<up_speed>\d+\.\d+)(?P<up_unit>[kKmMgG][iI]?[bB]/s)'
+)
+
+PENDING_PATTERN = re.compile(
+    r'Pending \((?P<peers>\d+) peers\), best: #(?P<best>\d+) \([^\)]+\), finalized #(?P<finalized>\d+) \([^\)]+\), ⬇ (?P<down_speed>\d+\.\d+)(?P<down_unit>[kKmMgG][iI]?[bB])/s ⬆ (?P<up_speed>\d+\.\d+)(?P<up_unit>[kKmMgG][iI]?[bB])/s'
+)
+
+CLAIMED_PATTERN = re.compile(r'Claimed.*?slot=(?P<slot>\d+)')
+
+# Raw-bytes prefilter. Every status pattern requires the download speed marker
+# and a claim requires 'Claimed', so a line containing neither can be dropped
+# before it is decoded; two substring scans cover the whole keyword set.
+PREFILTER_SPEED = '⬇'.encode('utf-8')
+PREFILTER_CLAIM = b'Claimed'
+
+def _speed_units():
+    # Every unit spelling the status patterns can capture ('kiB/s', ' B/s',
+    # 'MiB', 'KB/s', ...) mapped to its bytes/sec multiplier
+    decimal = {'': 1, 'k': 1000, 'm': 1000 ** 2, 'g': 1000 ** 3}
+    binary = {'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+    units = {}
+
+    for space, prefix, i, byte, per_second in itertools.product(('', ' '), ('', 'k', 'K', 'm', 'M', 'g', 'G'), ('', 'i', 'I'), 'bB', ('', '/s')):
+        if i and not prefix:
+            continue
+        scale = binary[prefix.lower()] if i else decimal[prefix.lower()]
+        units[f"{space}{prefix}{i}{byte}{per_second}"] = scale
+
+    return units
+
+
+# Built once so speeds are normalized with a single dict lookup
+SPEED_UNITS = _speed_units()
+
+
+def _status_record(status, match, level, epoch, name):
+    groups = match.groupdict()
+    bps = groups.get('bps')
+    target = groups.get('target')
+
+    return StatusRecord(
+        status,
+        level,
+        epoch,
+        name,
+        peers=int(groups['peers']),
+        best=int(groups['best']),
+        target=int(target) if target else None,
+        finalized=int(groups['finalized']),
+        bps=float(bps) if bps else None,
+        down=round(float(groups['down_speed']) * SPEED_UNITS[groups['down_unit']]),
+        up=round(float(groups['up_speed']) * SPEED_UNITS[groups['up_unit']])
+    )
+
+
+def _claim_record(status, match, level, epoch, name):
+    return ClaimRecord(
+        status,
+        level,
+        epoch,
+        name,
+        slot=int(match.group('slot')),
+        claim_type="Vote" if "vote" in match.string else "Block"
+    )
+
+
+# Discriminator keyword -> (Event Name, pattern, record builder)
+DISPATCH = {
+    'Idle': ('Idle', IDLE_PATTERN, _status_record),
+    'Preparing': ('Preparing', PREPARING_PATTERN, _status_record),
+    'Syncing': ('Syncing', SYNCING_PATTERN, _status_record),
+    'Pending': ('Pending', PENDING_PATTERN, _status_record),
+    'Claimed': ('Claim', CLAIMED_PATTERN, _claim_record),
+}
+
+
+class LogClassifier:
+    @staticmethod
+    def parse_log(log_str):
+        return Utils.parse_log(log_str)
+
+    @staticmethod
+    def classify(log, name):
+        # Parsed-log variant kept for the dict-based callers (parse_event, check_log)
+        data = log['Event Data']
+
+        key = DISCRIMINATOR.search(data)
+        if not key:
+            return None
+
+        record = LogClassifier._build(key, data, log["Event Level"], Utils.to_epoch(log["Event Datetime"]), name)
+        return record.to_event() if record else None
+
+    @staticmethod
+    def interesting(line):
+        # line is raw bytes; False means the line can't classify, True only that it might
+        return PREFILTER_SPEED in line or PREFILTER_CLAIM in line
+
+    @staticmethod
+    def classify_bytes(line, name):
+        if not LogClassifier.interesting(line):
+            return None
+
+        return LogClassifier.classify_line(line.decode('utf-8'), name)
+
+    @staticmethod
+    def classify_line(log_str, name):
+        # Raw line variant used by the pipeline: returns an EventRecord, and
+        # the timestamp is only parsed for lines that classify.
+        match = LOG_PATTERN.match(log_str)
+        if not match:
+            return None
+
+        data = match.group("data")
+
+        key = DISCRIMINATOR.search(data)
+        if not key:
+            return None
+
+        return LogClassifier._build(key, data, match.group("level"), Utils.to_epoch(match.group("datetime")), name)
+
+    @staticmethod
+    def _build(key, data, level, epoch, name):
+        event_name, pattern, build = DISPATCH[key.group()]
+        match = pattern.match(data, key.start())
+
+        if not match:
+            logger.error(f"No match for: {data}")
+            return None
+
+        return build(event_name, match, level, epoch, name)
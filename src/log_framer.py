@@ -0,0 +1,60 @@
+# `docker logs --timestamps` prefixes every line with RFC3339NanoFixed, e.g.
+# '2024-05-20T12:00:00.012345678Z ', which is always this many bytes
+DOCKER_STAMP_BYTES = 31
+
+
+class LogFramer:
+    """
+    Cuts a docker log stream into lines. Docker hands out one chunk per log
+    message for regular containers and arbitrary byte runs for TTY ones, and a
+    message can hold several lines or only part of one, so chunks are split on
+    newlines and partial tails are carried into the next chunk. Everything
+    stays bytes; nothing is decoded here.
+    """
+
+    def __init__(self, max_line_bytes=1024 * 1024):
+        # A line without a newline this long is passed on rather than buffered forever
+        self.max_line_bytes = max_line_bytes
+
+    def lines(self, chunks):
+        buffer = bytearray()
+
+        for chunk in chunks:
+            start = 0
+
+            while True:
+                end = chunk.find(b'\n', start)
+                if end == -1:
+                    break
+
+                if buffer:
+                    buffer += chunk[start:end]
+                    line = bytes(buffer)
+                    buffer.clear()
+                else:
+                    line = chunk[start:end]
+
+                start = end + 1
+                # TTY containers end lines with \r\n
+                if line.endswith(b'\r'):
+                    line = line[:-1]
+                if line.strip():
+                    yield line
+
+            if start < len(chunk):
+                buffer += chunk[start:]
+                if len(buffer) >= self.max_line_bytes:
+                    yield bytes(buffer)
+                    buffer.clear()
+
+        if buffer.strip():
+            yield bytes(buffer)
+
+    @staticmethod
+    def payload(line):
+        # The node's own log line behind docker's timestamp, found by width rather than a search
+        if line[DOCKER_STAMP_BYTES - 1:DOCKER_STAMP_BYTES] == b' ':
+            return line[DOCKER_STAMP_BYTES:]
+
+        # Not a fixed-width stamp (older daemon): fall back to the first space
+        return line.split(b' ', 1)[-1]
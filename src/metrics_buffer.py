@@ -0,0 +1,116 @@
+import bisect
+import math
+import threading
+import time
+from array import array
+
+from src.event_record import StatusRecord
+
+FIELDS = ('timestamp', 'peers', 'best', 'finalized', 'bps', 'cpu', 'mem')
+
+# Fields downsampled with max rather than mean
+MAX_FIELDS = {'best', 'finalized'}
+
+# Status events older than this are catch-up replay, not recent history
+MAX_EVENT_AGE = 120
+
+
+class MetricsBuffer:
+    """
+    Fixed-size columnar ring buffer of node metrics. Each field is a
+    preallocated array of doubles, so the footprint is capacity * 8 bytes
+    per field no matter how long the sidecar runs. Every status event or
+    resource sample appends a row carrying the latest value of every field;
+    fields not seen yet are NaN.
+    """
+
+    def __init__(self, capacity=86400):
+        self.capacity = capacity
+        self.columns = {field: array('d', [math.nan]) * capacity for field in FIELDS}
+        self.latest = {field: math.nan for field in FIELDS}
+        self.head = 0
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def append(self, timestamp, **values):
+        with self.lock:
+            self.latest.update(values)
+            self.latest['timestamp'] = timestamp
+
+            index = (self.head + self.size) % self.capacity
+            for field, column in self.columns.items():
+                column[index] = self.latest[field]
+
+            if self.size < self.capacity:
+                self.size += 1
+            else:
+                self.head = (self.head + 1) % self.capacity
+
+    def observe_event(self, event):
+        if not isinstance(event, StatusRecord):
+            return
+
+        # Rows are stamped on arrival so events and resource samples share one
+        # ordered time axis; replayed history is skipped instead
+        now = time.time()
+        if now - event.epoch > MAX_EVENT_AGE:
+            return
+
+        self.append(
+            now,
+            peers=event.peers,
+            best=event.best,
+            finalized=event.finalized,
+            bps=event.bps if event.bps is not None else math.nan
+        )
+
+    def observe_usage(self, usage):
+        self.append(
+            time.time(),
+            cpu=usage['Container CPU Usage Percent'],
+            mem=usage['Container Memory Usage']
+        )
+
+    def physical(self, index):
+        return (self.head + index) % self.capacity
+
+    def timestamp_at(self, index):
+        return self.columns['timestamp'][self.physical(index)]
+
+    def query(self, start=None, end=None, step=None):
+        # Rows with start <= timestamp <= end, optionally averaged into step-second buckets
+        with self.lock:
+            logical = range(self.size)
+            low = 0 if start is None else bisect.bisect_left(logical, start, key=self.timestamp_at)
+            high = self.size if end is None else bisect.bisect_right(logical, end, key=self.timestamp_at)
+
+            rows = [
+                {field: column[self.physical(index)] for field, column in self.columns.items()}
+                for index in range(low, high)
+            ]
+
+        if step:
+            rows = MetricsBuffer.downsample(rows, step)
+
+        return [{field: (None if math.isnan(value) else value) for field, value in row.items()} for row in rows]
+
+    @staticmethod
+    def downsample(rows, step):
+        buckets = {}
+        for row in rows:
+            buckets.setdefault(int(row['timestamp'] // step), []).append(row)
+
+        downsampled = []
+        for bucket, members in buckets.items():
+            row = {'timestamp': bucket * step}
+            for field in FIELDS[1:]:
+                values = [member[field] for member in members if not math.isnan(member[field])]
+                if not values:
+                    row[field] = math.nan
+                elif field in MAX_FIELDS:
+                    row[field] = max(values)
+                else:
+                    row[field] = sum(values) / len(values)
+            downsampled.append(row)
+
+        return downsampled
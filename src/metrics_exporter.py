@@ -0,0 +1,119 @@
+import threading
+
+from src.event_record import ClaimRecord, StatusRecord
+
+STATUS_EVENTS = ('Idle', 'Preparing', 'Syncing', 'Pending')
+
+# name -> (type, help)
+METRICS = {
+    'subspace_node_peers': ('gauge', 'Connected peers'),
+    'subspace_node_best_height': ('gauge', 'Best block height'),
+    'subspace_node_target_height': ('gauge', 'Sync target height'),
+    'subspace_node_finalized_height': ('gauge', 'Finalized block height'),
+    'subspace_node_sync_bps': ('gauge', 'Blocks per second imported while syncing'),
+    'subspace_node_download_bytes_per_second': ('gauge', 'Network download speed'),
+    'subspace_node_upload_bytes_per_second': ('gauge', 'Network upload speed'),
+    'subspace_node_status': ('gauge', 'Current node status, 1 for the active status'),
+    'subspace_node_sync_rate_blocks_per_second': ('gauge', 'Smoothed block import rate measured from best height'),
+    'subspace_node_sync_remaining_blocks': ('gauge', 'Blocks left to the sync target'),
+    'subspace_node_sync_eta_seconds': ('gauge', 'Estimated seconds until the node is in sync'),
+    'subspace_node_seconds_since_progress': ('gauge', 'Seconds since the best height last advanced'),
+    'subspace_node_sync_stalled': ('gauge', '1 when the best height has not advanced within the stall threshold'),
+    'subspace_node_claims_total': ('counter', 'Claimed slots by claim type'),
+    'subspace_node_claims_window': ('gauge', 'Claimed slots in the trailing window by claim type'),
+    'subspace_node_claims_expected': ('gauge', 'Claims the 7d rate predicts for the trailing window'),
+    'spaceport_container_cpu_percent': ('gauge', 'Container CPU usage percent'),
+    'spaceport_container_memory_usage_gib': ('gauge', 'Container memory usage in GiB'),
+    'spaceport_container_memory_percent': ('gauge', 'Container memory usage percent of limit'),
+    'spaceport_lines_parsed_total': ('counter', 'Log lines read by the sidecar'),
+    'spaceport_lines_filtered_total': ('counter', 'Log lines dropped by the prefilter before decoding'),
+    'spaceport_events_parsed_total': ('counter', 'Events parsed by the sidecar'),
+    'spaceport_events_shipped_total': ('counter', 'Events acknowledged by Nexus'),
+}
+
+
+class MetricsExporter:
+    """
+    Prometheus/OpenMetrics text exporter. Samples are kept as
+    {(metric, labels): value} and updated incrementally as events and
+    resource samples arrive, so a scrape only formats what is already there.
+    """
+
+    def __init__(self, collectors=()):
+        # collectors: callables returning {(metric, labels): value} at scrape
+        # time, for counters owned by other components
+        self.collectors = collectors
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def set(self, metric, labels, value):
+        if value is None:
+            return
+        with self.lock:
+            self.samples[(metric, labels)] = value
+
+    def inc(self, metric, labels, amount=1):
+        with self.lock:
+            self.samples[(metric, labels)] = self.samples.get((metric, labels), 0) + amount
+
+    def observe_event(self, labels, event):
+        if isinstance(event, ClaimRecord):
+            self.inc('subspace_node_claims_total', labels + (('type', event.claim_type.lower()),))
+            return
+
+        if not isinstance(event, StatusRecord):
+            return
+
+        self.set('subspace_node_peers', labels, event.peers)
+        self.set('subspace_node_best_height', labels, event.best)
+        self.set('subspace_node_target_height', labels, event.target)
+        self.set('subspace_node_finalized_height', labels, event.finalized)
+        self.set('subspace_node_sync_bps', labels, event.bps or 0)
+        self.set('subspace_node_download_bytes_per_second', labels, event.down)
+        self.set('subspace_node_upload_bytes_per_second', labels, event.up)
+        for status in STATUS_EVENTS:
+            self.set('subspace_node_status', labels + (('status', status.lower()),), int(status == event.name))
+
+    def observe_usage(self, labels, usage):
+        self.set('spaceport_container_cpu_percent', labels, usage['Container CPU Usage Percent'])
+        self.set('spaceport_container_memory_usage_gib', labels, usage['Container Memory Usage'])
+        self.set('spaceport_container_memory_percent', labels, usage['Container Memory Usage Percent'])
+
+    def forget(self, labels):
+        # Drops every sample carrying all of a container's labels
+        with self.lock:
+            for key in [key for key in self.samples if set(labels) <= set(key[1])]:
+                del self.samples[key]
+
+    @staticmethod
+    def format_labels(labels):
+        if not labels:
+            return ''
+        pairs = ','.join(f'{key}="{value}"' for key, value in labels)
+        return '{' + pairs + '}'
+
+    def render(self):
+        with self.lock:
+            samples = dict(self.samples)
+
+        for collector in self.collectors:
+            samples.update((key, value) for key, value in collector().items() if value is not None)
+
+        by_metric = {}
+        for (metric, labels), value in samples.items():
+            by_metric.setdefault(metric, []).append((labels, value))
+
+        lines = []
+        for metric, (metric_type, help_text) in METRICS.items():
+            if metric not in by_metric:
+                continue
+
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for labels, value in sorted(by_metric[metric]):
+                lines.append(f"{metric}{MetricsExporter.format_labels(labels)} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def get_metrics(self, query):
+        return 200, 'text/plain; version=0.0.4; charset=utf-8', self.render().encode('utf-8')
@@ -1,11 +1,14 @@
 from src.logger import logger
-from datetime import datetime
-import requests
-import sys
-import json
-import time
+from src.nexus_transport import NexusTransport, NexusUnavailable
+
 
 class NexusAPI:
+    # Shared by every call; replaced by configure() with the CLI settings
+    transport = NexusTransport()
+
+    def configure(**settings):
+        NexusAPI.transport = NexusTransport(**settings)
+
     def update_server(base_url, event):
         local_url = f"{base_url}/insert/server"
         response = NexusAPI.push(local_url, event)
@@ -18,15 +21,31 @@ class NexusAPI:
         logger.info(response.json())
 
 
-    def create_event(base_url, event):
+    def create_event(base_url, event, retry=True):
         local_url = f"{base_url}/insert/event"
-        response = NexusAPI.push(local_url, event)
+        response = NexusAPI.push(local_url, event, retry=retry)
         if response.status_code == 201: return response.json()
         else: return False
 
+    def create_events(base_url, events, retry=True):
+        local_url = f"{base_url}/insert/events"
+        response = NexusAPI.push(local_url, events, passthrough=(404, 405), retry=retry)
+        if response.status_code in (404, 405): return None
+        if response.status_code < 300: return response.json()
+        else: return False
+
+    def create_events_compact(base_url, body, retry=True):
+        # body is a gzipped batch from Records.encode_batch
+        local_url = f"{base_url}/insert/events/compact"
+        headers = {'Content-Type': 'application/json', 'Content-Encoding': 'gzip'}
+        response = NexusAPI.push(local_url, None, passthrough=(404, 405), retry=retry, data=body, headers=headers)
+        if response.status_code in (404, 405): return None
+        if response.status_code < 300: return response.json()
+        else: return False
+
     def get_events(base_url, name):
         local_url = f"{base_url}/get/events"
-        response = requests.get(local_url)
+        response = NexusAPI.transport.get(local_url)
         json_data = response.json()
 
         if response.status_code < 300:
@@ -37,7 +56,7 @@ class NexusAPI:
         
     def get_latest_events(base_url, name):
         local_url = f"{base_url}/get/events?event_source={name}&event_type=Node"
-        response = requests.get(local_url)
+        response = NexusAPI.transport.get(local_url)
         json_data = response.json()
 
         if response.status_code < 300:
@@ -57,24 +76,5 @@ class NexusAPI:
         logger.info(response.json())
 
 
-    def push(local_url, event):
-        max_retries = 10
-        retries = 0
-
-        while True:
-            try:
-                response = requests.post(local_url, json=event)
-                if response.status_code >= 300:
-                    logger.error(response.json())
-                    time.sleep(10)
-                    
-                return response
-
-            except Exception as e:
-                if retries == max_retries:
-                    logger.error('Max retries reached. Exiting...')
-                    sys.exit(1)
-                retries+=1
-                logger.error(f"Retries: {retries}, Max allowed: {max_retries}")
-                time.sleep(1)
-            
+    def push(local_url, event, passthrough=(), retry=True, data=None, headers=None):
+        return NexusAPI.transport.post(local_url, event, passthrough=passthrough, retry=retry, data=data, headers=headers)
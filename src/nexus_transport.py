@@ -0,0 +1,102 @@
+import gzip
+import json
+import random
+import threading
+import time
+
+import requests
+
+from src.logger import logger
+
+# Statuses worth retrying; any other 4xx means the request itself is wrong
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class NexusUnavailable(Exception):
+    # Raised by non-retrying pushes when Nexus can't be reached or answers with a retryable status
+    pass
+
+
+class NexusTransport:
+    """
+    HTTP transport shared by every NexusAPI call. Each thread keeps its own
+    requests.Session, so connections to Nexus are reused across batches
+    instead of paying TCP setup per post; every request carries connect and
+    read timeouts; JSON bodies above gzip_bytes are compressed. Retries use
+    full-jitter exponential backoff and only happen for network errors and
+    RETRYABLE_STATUSES.
+    """
+
+    def __init__(self, connect_timeout=3.05, read_timeout=30, gzip_bytes=16 * 1024, max_retries=10, base_backoff=0.5, max_backoff=30):
+        self.timeout = (connect_timeout, read_timeout)
+        self.gzip_bytes = gzip_bytes
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.local = threading.local()
+
+    def session(self):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            # A thread makes one request at a time, so the default pool is plenty
+            session = requests.Session()
+            self.local.session = session
+
+        return session
+
+    def encode(self, event, data, headers):
+        headers = dict(headers or {})
+        if data is None:
+            data = json.dumps(event).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+
+        if len(data) >= self.gzip_bytes and 'Content-Encoding' not in headers:
+            data = gzip.compress(data)
+            headers['Content-Encoding'] = 'gzip'
+
+        return data, headers
+
+    def backoff(self, attempt, response=None):
+        # Full jitter, or the server's Retry-After when it gives one in seconds
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+
+    def get(self, url):
+        return self.session().get(url, timeout=self.timeout)
+
+    def post(self, url, event=None, passthrough=(), retry=True, data=None, headers=None):
+        # With retry=False this makes a single attempt and raises NexusUnavailable
+        # instead of sleeping, so callers like the spool drainer own the backoff.
+        data, headers = self.encode(event, data, headers)
+        attempt = 0
+
+        while True:
+            try:
+                response = self.session().post(url, data=data, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                if not retry or attempt == self.max_retries:
+                    raise NexusUnavailable(str(e)) from e
+
+                delay = self.backoff(attempt)
+                logger.error(f"Nexus request failed ({e}), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            if response.status_code in passthrough or response.status_code < 300:
+                return response
+
+            if response.status_code not in RETRYABLE_STATUSES:
+                logger.error(f"Nexus rejected {url} with {response.status_code}: {response.text}")
+                return response
+
+            if not retry or attempt == self.max_retries:
+                raise NexusUnavailable(f"{response.status_code} from {url}")
+
+            delay = self.backoff(attempt, response)
+            logger.warning(f"Nexus answered {response.status_code}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            attempt += 1
+            time.sleep(delay)
@@ -1,77 +1,539 @@
-import docker
+import asyncio
 import sys
 import threading
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 import src.constants as constants
 from src.container_monitor import ContainerMonitor
+from src.docker_host import DockerHost
 from src.stream_monitor import StreamMonitor
 from src.logger import logger
 from src.nexus_api import NexusAPI
 from src.utils import Utils
 from src.event_parse import EventParse
+from src.event_batcher import EventBatcher
+from src.event_spool import EventSpool
+from src.event_sinks import FanoutSink, SQLiteSink
+from src.resource_sampler import ResourceSampler
+from src.resource_tracker import ResourceTracker
+from src.metrics_buffer import MetricsBuffer
+from src.local_api import LocalAPI
+from src.metrics_exporter import MetricsExporter
+from src.instrumentation import Instrumentation
+from src.claim_analytics import ClaimAnalytics, CLAIM_TYPES
+from src.sync_estimator import SyncEstimator
+from src.stream_pipeline import STATS_INTERVAL
 from datetime import datetime
 
 class Node:
     def __init__(self, config) -> None:
-        self.host_ip = config['Host IP']
         self.nexus_url = config['Nexus URL']
-        self.docker_client = docker.from_env()
-        self.container_id = None
+        # Every docker daemon being monitored. Fleet mode lists several; they share
+        # the worker pool, event loop, batcher and sink, so each extra host only
+        # adds a client and its docker events watcher.
+        if config['Docker Hosts']:
+            self.hosts = [DockerHost.parse(spec, config['Host IP'], config['State Dir']) for spec in config['Docker Hosts']]
+        else:
+            self.hosts = [DockerHost('local', ip=config['Host IP'], state_dir=config['State Dir'])]
+        self.fleet = bool(config['Docker Hosts'])
         self.stop_event = threading.Event()
-        self.container = {
-            'Container ID': None
+        self.batcher = EventBatcher(
+            self.nexus_url,
+            max_count=config['Batch Size'],
+            max_bytes=config['Batch Bytes'],
+            max_age=config['Batch Age'],
+            on_sent=StreamMonitor.handle_event,
+            wire_format=config['Wire Format']
+        )
+        # Every event leaves through self.sink: the spool drained to Nexus,
+        # the local SQLite store, or both
+        self.spool = None
+        self.store = None
+        sinks = []
+        if 'nexus' in config['Sinks']:
+            self.spool = EventSpool(config['Spool Dir'], max_bytes=config['Spool Max MB'] * 1024 * 1024)
+            sinks.append(self.spool)
+        if 'sqlite' in config['Sinks']:
+            self.store = SQLiteSink(config['SQLite Path'], config['SQLite Retention Days'])
+            sinks.append(self.store)
+        self.sink = sinks[0] if len(sinks) == 1 else FanoutSink(sinks)
+        self.coalesce_window = config['Coalesce Window']
+        self.queue_size = config['Queue Size']
+        self.sender_concurrency = config['Sender Concurrency']
+        self.discovery_interval = config['Discovery Interval']
+        self.history_size = config['History Size']
+        self.api_port = config['API Port']
+        self.api_host = config['API Host']
+        self.claim_summary_interval = config['Claim Summary Interval']
+        self.sync_progress_interval = config['Sync Progress Interval']
+        self.stall_seconds = config['Stall Seconds']
+        self.docker_timestamps = config['Docker Timestamps']
+        self.resource_thresholds = {
+            'cpu_threshold': config['Resource CPU Threshold'],
+            'memory_threshold': config['Resource Memory Threshold'],
+            'min_interval': config['Resource Min Interval'],
+            'max_interval': config['Resource Max Interval'],
         }
 
-    def get_container(self):
+        # Shared by every monitored container for blocking docker calls
+        self.workers = ThreadPoolExecutor(max_workers=config['Worker Threads'], thread_name_prefix='docker')
+        # Pipeline spooling and checkpoints get their own threads, so discovery
+        # stuck on an unreachable daemon can't hold up healthy hosts' log tails
+        self.pipeline_io = ThreadPoolExecutor(max_workers=config['Worker Threads'], thread_name_prefix='pipeline-io')
+
+        self.exporter = MetricsExporter(collectors=[self.collect_counters])
+        self.instrumentation = Instrumentation(config['Instrument'])
+        self.timed_send = self.instrumentation.timed('nexus', self.batcher.send)
+
+        # Container ID -> {'Host': DockerHost, 'Container': resources, 'Source': event source, 'Labels': metric labels,
+        #                  'Type': container type, 'Pipeline': StreamPipeline,
+        #                  'Future': run future, 'Sampler': ResourceSampler, 'Buffer': MetricsBuffer,
+        #                  'Analytics': ClaimAnalytics, 'Sync': SyncEstimator, 'Tracker': ResourceTracker}
+        self.monitors = {}
+        self.monitors_lock = threading.Lock()
+        self.loop = None
+        self.loop_ready = threading.Event()
+
+    @staticmethod
+    def container_type(container):
         try:
-            containers = self.docker_client.containers.list(all=True)
-            for container in containers:
-                if 'subspace/node' in container.image.tags[0]:
-                    self.container_id = container.id
-                    logger.info(f"Got Container with ID: {self.container_id}")
-
-            if not self.container_id:
-                logger.error('No matching containers found. Are you sure you have docker running?')
-                sys.exit(1)
-
-        except Exception as e:
-            logger.error(f'Error getting container:', exc_info=e)
-            sys.exit(1)
-        
+            tags = container.image.tags
+        except Exception:
+            # Image removed from under the container
+            return None
+
+        for tag in tags:
+            for image, container_type in constants.CONTAINER_IMAGES.items():
+                if image in tag:
+                    return container_type
+
+        return None
+
+    def discover_containers(self, host):
+        containers = host.client.containers.list(all=True)
+        discovered = {}
+
+        for container in containers:
+            container_type = Node.container_type(container)
+            if container_type:
+                discovered[container.id] = container_type
+
+        return discovered
+
+    def attach(self, host, container_id, container_type):
+        resources = ContainerMonitor.get_container_resources(container_id, host.client, host.ip, container_type)
+        if not resources:
+            return
+
+        name = resources['Container Name']
+        source, labels = self.identity(host, name)
+
+        logger.info(f"Registering {container_type} container {name} on {host.label}")
+        ContainerMonitor.update_container_resources(True, resources, self.sink, source)
+
+        buffer = MetricsBuffer(self.history_size)
+        analytics = ClaimAnalytics(source)
+        sync = SyncEstimator(source, self.stall_seconds)
+
+        pipeline = StreamMonitor.create_pipeline(
+            resources,
+            host.client,
+            self.nexus_url,
+            self.batcher,
+            self.sink,
+            host.state_dir,
+            self.coalesce_window,
+            [buffer.observe_event, analytics.observe, sync.observe, partial(self.exporter.observe_event, labels)],
+            self.queue_size,
+            self.instrumentation,
+            self.docker_timestamps,
+            source
+        )
+
+        sampler = ResourceSampler(
+            container_id,
+            host.client,
+            host.info,
+            container_type,
+            [buffer.observe_usage, partial(self.exporter.observe_usage, labels)]
+        )
+        sampler.start()
+
+        with self.monitors_lock:
+            self.monitors[container_id] = {
+                'Host': host,
+                'Container': resources,
+                'Source': source,
+                'Labels': labels,
+                'Type': container_type,
+                'Pipeline': pipeline,
+                'Future': asyncio.run_coroutine_threadsafe(pipeline.run(), self.loop),
+                'Sampler': sampler,
+                'Buffer': buffer,
+                'Analytics': analytics,
+                'Sync': sync,
+                'Tracker': ResourceTracker(resources, **self.resource_thresholds)
+            }
+
+    def identity(self, host, name):
+        # Container names are only unique per docker daemon, so in fleet mode
+        # events, buffers and metrics are told apart by the host label as well
+        if not self.fleet:
+            return name, (('container', name),)
+        return f"{host.label}/{name}", (('container', name), ('host', host.label))
+
+    def detach(self, container_id):
+        with self.monitors_lock:
+            monitor = self.monitors.pop(container_id, None)
+
+        if monitor:
+            logger.info(f"Container {monitor['Container']['Container Name']} is gone, stopping its monitors")
+            monitor['Pipeline'].stop()
+            monitor['Sampler'].stop()
+            self.exporter.forget(monitor['Labels'])
+
+    def sync_containers(self, host):
+        if not host.connect():
+            return
+
+        with host.sync_lock:
+            try:
+                discovered = self.discover_containers(host)
+                host.connected = True
+            except Exception:
+                host.connected = False
+                raise
+
+            with self.monitors_lock:
+                known = {container_id for container_id, monitor in self.monitors.items() if monitor['Host'] is host}
+
+            for container_id in known - set(discovered):
+                self.detach(container_id)
+
+            for container_id in set(discovered) - known:
+                self.attach(host, container_id, discovered[container_id])
+
+    def start_discovery(self):
+        logger.info(f"Starting Container Discovery on {len(self.hosts)} docker host(s)")
+        self.loop_ready.wait()
+
+        while not self.stop_event.is_set():
+            # Hosts are scanned side by side on the worker pool so one slow daemon doesn't hold up the rest
+            futures = {host: self.workers.submit(self.sync_containers, host) for host in self.hosts}
+            for host, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f'Error discovering containers on {host.label}:', exc_info=e)
+
+            self.stop_event.wait(self.discovery_interval)
+
+    def start_docker_events(self, host):
+        # Container lifecycle and static attribute changes arrive here as they
+        # happen, so restarts re-attach at once instead of on a polling timer
+        logger.info(f"Starting Docker Event Watcher for {host.label}")
+
+        while not self.stop_event.is_set():
+            try:
+                if not host.connect():
+                    self.stop_event.wait(5)
+                    continue
+
+                events = host.client.events(decode=True, filters={'type': ['container', 'daemon']})
+                host.connected = True
+
+                for event in events:
+                    if self.stop_event.is_set():
+                        break
+
+                    self.handle_docker_event(host, event)
+
+            except Exception as e:
+                host.connected = False
+                logger.error(f'Error watching docker events on {host.label}:', exc_info=e)
+                self.stop_event.wait(5)
+
+    def handle_docker_event(self, host, event):
+        action = event.get('Action')
+
+        if event.get('Type') == 'daemon':
+            if action == 'reload' and host.refresh_info():
+                with self.monitors_lock:
+                    samplers = [monitor['Sampler'] for monitor in self.monitors.values() if monitor['Host'] is host]
+                for sampler in samplers:
+                    self.workers.submit(sampler.refresh, host.info)
+            return
+
+        container_id = event.get('id')
+        with self.monitors_lock:
+            monitor = self.monitors.get(container_id)
+
+        if not monitor:
+            # A subspace container created or started since the last discovery pass;
+            # anything else would only cost a full scan of the host
+            image = event.get('Actor', {}).get('Attributes', {}).get('image', '')
+            if action in ('create', 'start') and any(fragment in image for fragment in constants.CONTAINER_IMAGES):
+                self.workers.submit(self.sync_containers, host)
+            return
+
+        name = monitor['Container']['Container Name']
+
+        if action in ('start', 'restart'):
+            logger.info(f"Container {name} {action}ed, re-attaching log stream and stats")
+            monitor['Pipeline'].wake()
+            monitor['Sampler'].wake()
+            self.workers.submit(monitor['Sampler'].refresh)
+
+        elif action == 'die':
+            logger.warning(f"Container {name} stopped with exit code {event.get('Actor', {}).get('Attributes', {}).get('exitCode')}")
+            self.workers.submit(monitor['Sampler'].refresh)
+
+        elif action == 'destroy':
+            self.detach(container_id)
+
+        elif action in ('rename', 'update'):
+            self.workers.submit(monitor['Sampler'].refresh)
+
+    def stop(self):
+        # Safe to call from any thread, before or after the event loop has started
+        self.stop_event.set()
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.stopping.set)
+
     def start_stream_monitor(self):
         logger.info("Starting Log Monitor")
-        StreamMonitor.monitor_stream(self.container, self.docker_client, self.stop_event, self.nexus_url)
+        asyncio.run(self.run_pipelines())
+
+    async def run_pipelines(self):
+        # One event loop hosts the pipelines of every monitored container
+        self.stopping = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        self.loop.set_default_executor(self.pipeline_io)
+        self.loop_ready.set()
+
+        # Set through stop(), so shutdown doesn't park an executor thread for the process lifetime
+        if self.stop_event.is_set():
+            self.stopping.set()
+        await self.stopping.wait()
+
+        with self.monitors_lock:
+            monitors = list(self.monitors.values())
+
+        for monitor in monitors:
+            monitor['Pipeline'].stop()
+
+        # Let each pipeline flush its last batch into the sink
+        futures = [asyncio.wrap_future(monitor['Future']) for monitor in monitors]
+        if futures:
+            await asyncio.wait(futures, timeout=10)
+
+    def start_spool_drainer(self):
+        self.spool.drain(self.ship, self.batcher.max_count, self.stop_event)
+
+    def ship(self, events):
+        if not self.instrumentation.enabled:
+            return self.batcher.send(events)
+
+        # Nexus round trips are timed here, along with how far behind the log each acked event was
+        sent = self.timed_send(events)
+        for event in events[:sent]:
+            self.instrumentation.record_lag(event)
+
+        return sent
 
     def start_container_monitor(self):
+        # Each container is polled on its tracker's adaptive interval and only changes are sent
         while not self.stop_event.is_set():
-            self.stop_event.wait(10)
-            self.container = ContainerMonitor.get_container_resources(self.container_id, self.docker_client, self.host_ip)
-            ContainerMonitor.update_container_resources(False, self.container, self.nexus_url)
+            with self.monitors_lock:
+                monitors = list(self.monitors.values())
+
+            now = time.monotonic()
+            # Re-checked at least every min interval so newly attached containers are picked up
+            due = min((monitor['Tracker'].due for monitor in monitors), default=float('inf'))
+            if due > now:
+                self.stop_event.wait(min(due - now, self.resource_thresholds['min_interval']))
+                continue
+
+            for monitor in monitors:
+                tracker = monitor['Tracker']
+                if tracker.due > now:
+                    continue
+
+                resources = monitor['Sampler'].latest()
+                if not resources:
+                    tracker.due = now + tracker.interval
+                    continue
+
+                monitor['Container'] = resources
+                changes = tracker.changes(resources, now)
+                if changes:
+                    ContainerMonitor.update_container_resources(False, changes, self.sink, monitor['Source'])
+
+    def start_claim_summaries(self):
+        # Rolling claim statistics are shipped as one summary event per container per interval
+        logger.info("Starting Claim Summaries")
+        while not self.stop_event.wait(self.claim_summary_interval):
+            with self.monitors_lock:
+                monitors = list(self.monitors.values())
+
+            now = time.time()
+            summaries = [monitor['Analytics'].summary(now) for monitor in monitors]
+            summaries = [summary for summary in summaries if summary]
+            if summaries:
+                self.sink.append(summaries)
+
+    def start_sync_progress(self):
+        # Progress events only go out while a node is behind its sync target or stalled
+        logger.info("Starting Sync Progress")
+        while not self.stop_event.wait(self.sync_progress_interval):
+            with self.monitors_lock:
+                monitors = list(self.monitors.values())
+
+            now = time.time()
+            events = [monitor['Sync'].event(now) for monitor in monitors]
+            events = [event for event in events if event]
+            if events:
+                self.sink.append(events)
+
+    def buffers(self):
+        with self.monitors_lock:
+            return {monitor['Source']: monitor['Buffer'] for monitor in self.monitors.values()}
+
+    def collect_counters(self):
+        with self.monitors_lock:
+            monitors = list(self.monitors.values())
+
+        counters = {('spaceport_events_shipped_total', ()): self.batcher.shipped}
+        for monitor in monitors:
+            labels = monitor['Labels']
+            counters[('spaceport_lines_parsed_total', labels)] = monitor['Pipeline'].lines_read
+            counters[('spaceport_lines_filtered_total', labels)] = monitor['Pipeline'].lines_filtered
+            counters[('spaceport_events_parsed_total', labels)] = monitor['Pipeline'].events_parsed
+
+            sync = monitor['Sync'].snapshot()
+            if sync:
+                counters[('subspace_node_sync_rate_blocks_per_second', labels)] = sync['Rate']
+                counters[('subspace_node_sync_remaining_blocks', labels)] = sync['Remaining']
+                counters[('subspace_node_sync_eta_seconds', labels)] = sync['ETA Seconds']
+                counters[('subspace_node_seconds_since_progress', labels)] = sync['Seconds Since Progress']
+                counters[('subspace_node_sync_stalled', labels)] = int(sync['Stalled'])
+
+            for window, stats in monitor['Analytics'].windows_summary(time.time()).items():
+                for claim_type in CLAIM_TYPES:
+                    claim_labels = labels + (('type', claim_type.lower()), ('window', window))
+                    counters[('subspace_node_claims_window', claim_labels)] = stats[f"{claim_type}s"]
+                    if f"Expected {claim_type}s" in stats:
+                        counters[('subspace_node_claims_expected', claim_labels)] = stats[f"Expected {claim_type}s"]
+
+        return counters
+
+    def pipeline_stats(self):
+        # Programmatic view of pipeline health: per-container counters and queues plus stage timings
+        with self.monitors_lock:
+            monitors = list(self.monitors.values())
+
+        return {
+            'Hosts': {
+                host.label: {
+                    'Connected': host.connected,
+                    'Containers': sum(monitor['Host'] is host for monitor in monitors),
+                }
+                for host in self.hosts
+            },
+            'Pipelines': {monitor['Source']: monitor['Pipeline'].stats() for monitor in monitors},
+            'Spool': self.spool.stats() if self.spool else None,
+            'Instrumentation': self.instrumentation.snapshot(),
+        }
+
+    def get_stats(self, query):
+        return LocalAPI.json_response(self.pipeline_stats())
+
+    def get_events(self, query):
+        # Events from the local store, filtered like /history: ?container=&name=&since=&until=&limit=&count=1
+        source = query.get('container', [None])[0]
+        name = query.get('name', [None])[0]
+        try:
+            since = float(query['since'][0]) if 'since' in query else None
+            until = float(query['until'][0]) if 'until' in query else None
+            limit = int(query['limit'][0]) if 'limit' in query else 1000
+        except ValueError:
+            return LocalAPI.json_response({'message': 'since and until must be numbers, limit an integer'}, 400)
+
+        if query.get('count', ['0'])[0] == '1':
+            return LocalAPI.json_response({'count': self.store.count(source, name, since, until)})
+
+        return LocalAPI.json_response(self.store.query(source, name, since, until, limit))
+
+    def start_instrumentation_report(self):
+        logger.info("Starting Instrumentation Report")
+        while not self.stop_event.wait(STATS_INTERVAL):
+            logger.info(f"Pipeline instrumentation: {self.instrumentation.snapshot()}")
 
     def start_metrics_monitor(self):
+        if not self.api_port:
+            logger.info("Metrics Monitor disabled")
+            return
+
+        # Prometheus scrapes /metrics on the same port as the local history API
         logger.info("Starting Metrics Monitor")
-        pass
+        api = LocalAPI(self.api_port, self.buffers, self.api_host)
+        api.add_route('/metrics', self.exporter.get_metrics)
+        api.add_route('/stats', self.get_stats)
+        if self.store:
+            api.add_route('/events', self.get_events)
+        api.run(self.stop_event)
 
     # Init
     def init(self):
         try:
-            self.get_container()
-            logger.info("Getting initial container resources")
-            self.container = ContainerMonitor.get_container_resources(self.container_id, self.docker_client, self.host_ip)
-            logger.info("Registering container")
-            ContainerMonitor.update_container_resources(True, self.container, self.nexus_url)
+            # A single host must be up with containers to monitor; a fleet starts with whatever is reachable
+            if not self.fleet:
+                host = self.hosts[0]
+                if not host.connect() or not self.discover_containers(host):
+                    logger.error('No matching containers found. Are you sure you have docker running?')
+                    sys.exit(1)
 
             log_monitor_thread = threading.Thread(target=self.start_stream_monitor)
+            discovery_thread = threading.Thread(target=self.start_discovery)
             resource_monitor_thread = threading.Thread(target=self.start_container_monitor)
             metrics_monitor_thread = threading.Thread(target=self.start_metrics_monitor)
+            docker_events_threads = [
+                threading.Thread(target=self.start_docker_events, args=(host,), daemon=True, name=f"events-{host.label}")
+                for host in self.hosts
+            ]
+
+            spool_drainer_threads = []
+            if self.spool:
+                logger.info(f"Starting {self.sender_concurrency} Spool Drainers")
+                spool_drainer_threads = [
+                    threading.Thread(target=self.start_spool_drainer) for _ in range(self.sender_concurrency)
+                ]
 
             log_monitor_thread.start()
+            discovery_thread.start()
             resource_monitor_thread.start()
             metrics_monitor_thread.start()
+            for thread in docker_events_threads:
+                thread.start()
+            if self.instrumentation.enabled:
+                threading.Thread(target=self.start_instrumentation_report, daemon=True).start()
+            if self.claim_summary_interval:
+                threading.Thread(target=self.start_claim_summaries, daemon=True).start()
+            if self.sync_progress_interval:
+                threading.Thread(target=self.start_sync_progress, daemon=True).start()
+            if self.store:
+                threading.Thread(target=self.store.run_retention, args=(self.stop_event,), daemon=True).start()
+            for thread in spool_drainer_threads:
+                thread.start()
 
             log_monitor_thread.join()
+            discovery_thread.join()
             resource_monitor_thread.join()
             metrics_monitor_thread.join()
+            for thread in spool_drainer_threads:
+                thread.join()
 
         except KeyboardInterrupt:
             print("Stop signal received. Gracefully shutting down monitors.")
-            self.stop_event.set()  # Ensure the stop event is set
\ No newline at end of file
+            self.stop()
@@ -0,0 +1,94 @@
+import threading
+
+from src.container_monitor import ContainerMonitor
+from src.logger import logger
+
+
+class ResourceSampler:
+    """
+    Keeps one streaming stats connection open per container. Docker pushes a
+    sample roughly every second with precpu already filled in, so there is no
+    two-second blocking call per reading. Host info and the static container
+    attributes are cached and only re-read when refresh() is called from a
+    docker event.
+    """
+
+    def __init__(self, container_id, docker_client, host_info, container_type, observers=()):
+        self.container_id = container_id
+        self.docker_client = docker_client
+        self.host_info = host_info
+        self.container_type = container_type
+        # Called with every usage sample, e.g. local metrics
+        self.observers = observers
+
+        self.stop_event = threading.Event()
+        # Set from the docker events watcher when the container (re)starts
+        self.started = threading.Event()
+        self.lock = threading.Lock()
+        self.attrs = None
+        self.usage = None
+        self.samples = 0
+
+        self.refresh()
+
+    def refresh(self, host_info=None):
+        try:
+            container = self.docker_client.containers.get(self.container_id)
+            attrs = ContainerMonitor.get_container_attrs(container, self.container_type)
+
+            with self.lock:
+                self.attrs = attrs
+                if host_info:
+                    self.host_info = host_info
+
+        except Exception as e:
+            logger.error(f"Error refreshing container {self.container_id}:", exc_info=e)
+
+    def latest(self):
+        # Most recent full resource dict, or None before the first sample; never blocks on docker
+        with self.lock:
+            if not self.attrs or not self.usage:
+                return None
+
+            return {**self.host_info, **self.attrs, **self.usage}
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True, name=f"stats-{self.container_id[:12]}").start()
+
+    def wake(self):
+        self.started.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.started.set()
+
+    def run(self):
+        while not self.stop_event.is_set():
+            self.started.clear()
+            try:
+                container = self.docker_client.containers.get(self.container_id)
+
+                for stats in container.stats(stream=True, decode=True):
+                    # A start event means this stream belongs to the previous run
+                    if self.stop_event.is_set() or self.started.is_set():
+                        break
+
+                    # A stopped container keeps streaming empty readings
+                    usage = ContainerMonitor.get_container_usage(stats)
+                    if not usage:
+                        continue
+
+                    with self.lock:
+                        self.usage = usage
+                        self.samples += 1
+
+                    for observer in self.observers:
+                        observer(usage)
+
+            except Exception as e:
+                if self.stop_event.is_set():
+                    break
+                logger.error(f"Error sampling container {self.container_id}:", exc_info=e)
+
+            # Stream ended, usually because the container stopped; reconnect on its start event
+            self.started.wait(5)
@@ -0,0 +1,81 @@
+import time
+
+# Usage fields compared against a threshold instead of for equality
+CPU_FIELD = 'Container CPU Usage Percent'
+MEMORY_FIELDS = ('Container Memory Usage', 'Container Memory Usage Percent')
+
+# Fields every update carries so Nexus can tell which container it is for
+KEY_FIELDS = ('Container ID', 'Container Name')
+
+
+class ResourceTracker:
+    """
+    Change tracking for one container's resource updates. The register event
+    carries the full resource dict; after that changes() returns only what
+    Nexus hasn't seen: static fields (host info, image, IP, status) when they
+    differ at all, CPU when it moved cpu_threshold percentage points and
+    memory when its percentage moved memory_threshold points since the last
+    update sent. A quiet container still sends its usage every heartbeat
+    seconds so Nexus can tell it is alive.
+
+    The polling interval adapts the same way: it halves towards min_interval
+    while CPU or memory are moving between polls and backs off towards
+    max_interval while they are stable.
+    """
+
+    def __init__(self, resources, cpu_threshold=5.0, memory_threshold=2.0, min_interval=2, max_interval=60, heartbeat=300):
+        self.cpu_threshold = cpu_threshold
+        self.memory_threshold = memory_threshold
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.heartbeat = heartbeat
+
+        now = time.monotonic()
+        self.sent = dict(resources)
+        self.sent_at = now
+        self.previous = dict(resources)
+        self.interval = min(max(10, min_interval), max_interval)
+        self.due = now + self.interval
+
+    def moved(self, old, new):
+        # CPU or memory moved beyond their thresholds between two resource dicts
+        cpu = abs(new.get(CPU_FIELD, 0) - old.get(CPU_FIELD, 0)) >= self.cpu_threshold
+        memory = abs(new.get(MEMORY_FIELDS[1], 0) - old.get(MEMORY_FIELDS[1], 0)) >= self.memory_threshold
+        return cpu, memory
+
+    def changes(self, resources, now=None):
+        # Fields to send for this poll, or None when nothing worth sending changed
+        now = now or time.monotonic()
+
+        cpu, memory = self.moved(self.sent, resources)
+        if now - self.sent_at >= self.heartbeat:
+            cpu = memory = True
+        # Usage of a container registered while stopped goes out with its first sample
+        cpu = cpu or CPU_FIELD not in self.sent
+        memory = memory or MEMORY_FIELDS[1] not in self.sent
+
+        changed = {
+            field: value for field, value in resources.items()
+            if field != CPU_FIELD and field not in MEMORY_FIELDS and self.sent.get(field) != value
+        }
+        if cpu:
+            changed[CPU_FIELD] = resources.get(CPU_FIELD)
+        if memory:
+            changed.update({field: resources.get(field) for field in MEMORY_FIELDS})
+
+        self.adapt(resources, now)
+        if not changed:
+            return None
+
+        self.sent.update(changed)
+        self.sent_at = now
+        return {**{field: resources.get(field) for field in KEY_FIELDS}, **changed}
+
+    def adapt(self, resources, now):
+        if any(self.moved(self.previous, resources)):
+            self.interval = max(self.min_interval, self.interval / 2)
+        else:
+            self.interval = min(self.max_interval, self.interval * 1.5)
+
+        self.previous = dict(resources)
+        self.due = now + self.interval
@@ -0,0 +1,117 @@
+from src.event_record import StatusRecord
+
+
+class StatusWindow:
+    def __init__(self, status):
+        self.status = status
+        self.count = 0
+        self.first = None
+        self.last = None
+
+        self.peers_min = None
+        self.peers_max = None
+        self.peers_sum = 0
+        self.bps_sum = 0.0
+        self.bps_count = 0
+        self.down_sum = 0
+        self.up_sum = 0
+
+    def add(self, record):
+        peers = record.peers
+
+        if not self.count:
+            self.first = record
+            self.peers_min = peers
+            self.peers_max = peers
+
+        self.count += 1
+        self.last = record
+        self.peers_min = min(self.peers_min, peers)
+        self.peers_max = max(self.peers_max, peers)
+        self.peers_sum += peers
+        if record.bps is not None:
+            self.bps_sum += record.bps
+            self.bps_count += 1
+        self.down_sum += record.down
+        self.up_sum += record.up
+
+    def summary(self):
+        last = self.last
+
+        return StatusRecord(
+            self.status,
+            last.level,
+            last.epoch,
+            last.source,
+            peers=last.peers,
+            best=last.best,
+            target=last.target,
+            finalized=last.finalized,
+            bps=round(self.bps_sum / self.bps_count, 2) if self.bps_count else None,
+            down=round(self.down_sum / self.count),
+            up=round(self.up_sum / self.count),
+            window=(
+                self.peers_min,
+                self.peers_max,
+                round(self.peers_sum / self.count, 2),
+                self.first.best,
+                self.first.finalized,
+                self.count,
+                self.first.epoch,
+                last.epoch,
+            )
+        )
+
+
+class StatusCoalescer:
+    """
+    Folds consecutive Idle/Preparing/Syncing/Pending events into one summary
+    per window. The first event of a status run is emitted as-is so status
+    transitions show up immediately; a big peer swing or the chain going
+    backwards closes the window early. Anything that isn't a status event
+    (claims) passes straight through. Windows are timed on the log
+    timestamps, so a catch-up replay coalesces the same way a live tail does.
+    """
+
+    def __init__(self, window=60, peers_threshold=5):
+        self.window = window
+        self.peers_threshold = peers_threshold
+        self.current = None
+        self.reference = None
+
+    def add(self, event):
+        # Returns the list of events to forward in place of this one
+        if not isinstance(event, StatusRecord):
+            return [event]
+
+        if not self.current or self.current.status != event.name or self.big_change(event):
+            emitted = self.flush()
+            self.current = StatusWindow(event.name)
+            self.reference = event
+            emitted.append(event)
+            return emitted
+
+        emitted = []
+        if self.current.count and event.epoch - self.current.first.epoch >= self.window:
+            emitted = self.flush()
+
+        self.current.add(event)
+        return emitted
+
+    def held(self):
+        # The oldest event folded into the open window and not emitted yet, if any
+        return self.current.first if self.current and self.current.count else None
+
+    def big_change(self, event):
+        return (
+            abs(event.peers - self.reference.peers) >= self.peers_threshold
+            or event.best < self.reference.best
+        )
+
+    def flush(self):
+        if not self.current or not self.current.count:
+            return []
+
+        summary = self.current.summary()
+        self.current = StatusWindow(self.current.status)
+        return [summary]
@@ -0,0 +1,452 @@
+import asyncio
+import calendar
+import collections
+import threading
+import time
+
+import requests
+
+from src.checkpoint import Checkpoint
+from src.instrumentation import Instrumentation
+from src.logger import logger
+from src.log_classifier import LogClassifier
+from src.log_framer import LogFramer
+from src.nexus_api import NexusAPI
+from src.utils import Utils
+
+STATS_INTERVAL = 60
+
+# Longest the reader waits for a start event before checking the container itself
+LIFECYCLE_TIMEOUT = 300
+
+# Backoff between attempts to spool a batch the sink refused, doubling up to the max
+SPOOL_RETRY_MIN = 1
+SPOOL_RETRY_MAX = 30
+
+# Stages timed when instrumentation is enabled; 'read' is time spent waiting
+# on the docker stream, 'enqueue' is time the reader spent blocked on a full queue
+STAGES = ('read', 'enqueue', 'decode', 'parse', 'spool')
+
+
+class QueueStats:
+    def __init__(self, name, maxsize, bounded=True, depth=None):
+        self.name = name
+        self.maxsize = maxsize
+        # An unbounded queue leaves the bound to its producer, e.g. the reader thread's slots
+        self.queue = asyncio.Queue(maxsize if bounded else 0)
+        # Measures depth in the unit of maxsize when items are runs of them, e.g. lines
+        self.depth = depth or self.queue.qsize
+        self.put_total = 0
+        self.blocked_total = 0
+        self.blocked_seconds = 0.0
+        self.max_depth = 0
+
+    async def put(self, item, count=1):
+        # Counts every put that found the queue full, and how long the producer waited
+        if self.queue.full():
+            self.blocked_total += 1
+            started = time.monotonic()
+            await self.queue.put(item)
+            self.blocked_seconds += time.monotonic() - started
+            self.counted(count)
+        else:
+            self.put_nowait(item, count)
+
+    def put_nowait(self, item, count=1):
+        self.queue.put_nowait(item)
+        self.counted(count)
+
+    def counted(self, count=1):
+        self.put_total += count
+        depth = self.depth()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    async def get(self):
+        return await self.queue.get()
+
+    def snapshot(self):
+        return {
+            'Queue': self.name,
+            'Depth': self.depth(),
+            'Max Depth': self.max_depth,
+            'Capacity': self.maxsize,
+            'Puts': self.put_total,
+            'Blocked Puts': self.blocked_total,
+            'Blocked Seconds': round(self.blocked_seconds, 3),
+        }
+
+
+class StreamPipeline:
+    """
+    Log reader -> parser -> batcher -> sink stages joined by bounded queues.
+
+    The docker log generator blocks, so the reader runs in its own thread,
+    frames the raw stream into lines and hands them to the event loop in runs,
+    one loop wake-up per burst rather than per line; when the line queue is
+    full the reader thread waits, which is the backpressure on the docker
+    stream. Batches end in the event sink, normally the EventSpool whose
+    drainers ship them to Nexus, so network I/O never holds up reading or
+    parsing.
+    """
+
+    def __init__(self, container_data, docker_client, nexus_url, batcher, sink, checkpoint, coalescer=None, observers=(), queue_size=10000, instrumentation=None, docker_timestamps=True, source=None):
+        self.container_data = container_data
+        # What events are tagged with; in fleet mode the host label keeps same-named containers apart
+        self.source = source or container_data['Container Name']
+        self.docker_client = docker_client
+        self.stop_event = threading.Event()
+        # Set from the docker events watcher when the container (re)starts
+        self.started = threading.Event()
+        self.loop = None
+        self.nexus_url = nexus_url
+        self.batcher = batcher
+        self.sink = sink
+        self.checkpoint = checkpoint
+        self.coalescer = coalescer
+        # Called with every parsed event before coalescing, e.g. local metrics
+        self.observers = observers
+        self.queue_size = queue_size
+        # With docker's fixed-width timestamps the checkpoint cursor is the
+        # daemon's receive time, which every line has, even continuation lines
+        self.docker_timestamps = docker_timestamps
+        self.framer = LogFramer()
+
+        # Per-stage timings are only taken when instrumentation is enabled, so
+        # the disabled hot path pays for one boolean check per stage
+        self.instrumentation = instrumentation or Instrumentation()
+        self.timing = self.instrumentation.enabled
+        self.stages = {name: self.instrumentation.stage(name) for name in STAGES} if self.timing else {}
+
+        self.lines_read = 0
+        self.lines_filtered = 0
+        self.events_parsed = 0
+        self.events_coalesced = 0
+        self.batches_spooled = 0
+
+        # last_line is the last line read from docker and is used to re-attach
+        # within this process; the checkpoint only moves once the batch holding
+        # a line is durable in the sink.
+        self.last_line = None
+
+    def stats(self):
+        return {
+            'Lines Read': self.lines_read,
+            'Lines Filtered': self.lines_filtered,
+            'Events Parsed': self.events_parsed,
+            'Events Coalesced': self.events_coalesced,
+            'Batches Spooled': self.batches_spooled,
+            'Queues': [queue.snapshot() for queue in (self.lines, self.events, self.batches)],
+        }
+
+    def wake(self):
+        # Container started: re-attach the log stream now instead of at the next check
+        self.started.set()
+
+    def stop(self):
+        # Safe to call from any thread, before or after run() has started
+        self.stop_event.set()
+        self.started.set()
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.stopped.set)
+
+    async def run(self):
+        self.stopped = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        if self.stop_event.is_set():
+            self.stopped.set()
+
+        # Free places for lines, taken by the reader thread and given back by the parser
+        self.slots = threading.Semaphore(self.queue_size)
+        # Holds runs of lines, one per hand-off from the reader thread; counted
+        # in lines, parked or queued, so depth and capacity compare
+        self.lines = QueueStats('Lines', self.queue_size, bounded=False, depth=lambda: self.queue_size - self.slots._value)
+        # Lines read but not on the loop yet, and whether a hand-off is already scheduled
+        self.pending = collections.deque()
+        self.handoff_scheduled = False
+        # Runs of (event, cursor), one per run of lines; the line slots already bound their size
+        self.events = QueueStats('Events', 4)
+        self.batches = QueueStats('Batches', 4)
+
+        reader = threading.Thread(target=self.read_logs, daemon=True)
+        reader.start()
+
+        stages = [
+            asyncio.create_task(self.parse_stage()),
+            asyncio.create_task(self.batch_stage()),
+            asyncio.create_task(self.spool_stage()),
+        ]
+        reporter = asyncio.create_task(self.report_stats())
+
+        await self.stopped.wait()
+
+        # The reader may be parked inside the docker generator, so shut the
+        # stages down from the front of the pipeline instead of waiting on it;
+        # the end marker isn't a line, so it isn't counted as one
+        await self.lines.put(None, 0)
+        await asyncio.gather(*stages)
+        reporter.cancel()
+        logger.info(f"Stream pipeline for {self.container_data['Container Name']} stopped: {self.stats()}")
+
+    def feed(self, line):
+        # No round trip to the loop per line: the reader takes a free slot,
+        # which only blocks while the queue is full, and parks the line; one
+        # hand-off per burst moves everything parked onto the loop as a run
+        if not self.slots.acquire(blocking=False):
+            self.lines.blocked_total += 1
+            started = time.monotonic()
+            while not self.slots.acquire(timeout=1):
+                if self.stop_event.is_set():
+                    return
+            self.lines.blocked_seconds += time.monotonic() - started
+
+        self.pending.append(line)
+        if not self.handoff_scheduled:
+            self.handoff_scheduled = True
+            self.loop.call_soon_threadsafe(self.hand_off)
+
+    def hand_off(self):
+        # Runs on the loop. The flag is cleared first, so a line parked while
+        # draining either makes this run or schedules the next hand-off.
+        self.handoff_scheduled = False
+        pending = self.pending
+        lines = [pending.popleft() for _ in range(len(pending))]
+        if lines:
+            self.lines.put_nowait(lines, len(lines))
+
+    def read_logs(self):
+        container = self.docker_client.containers.get(self.container_data['Container ID'])
+
+        while not self.stop_event.is_set():
+            try:
+                # Cleared before the status check so a start event racing it is not lost
+                self.started.clear()
+                container.reload()
+                if container.status != 'running':
+                    logger.warning(f"Container {self.container_data['Container Name']} is {container.status}, waiting for it to start")
+                    self.started.wait(LIFECYCLE_TIMEOUT)
+                    continue
+
+                cursor = Checkpoint.cursor(self.last_line.strip()) if self.last_line else self.checkpoint.load()
+                since = Checkpoint.since(cursor) if cursor else self.first_start()
+                # No start point means the whole log; docker-py rejects since=0
+                options = {'since': since} if since else {}
+                chunks = container.logs(stdout=True, stderr=True, stream=True, follow=True, timestamps=self.docker_timestamps, **options)
+                generator = self.framer.lines(chunks)
+
+                if cursor:
+                    logger.info(f"Resuming Logs After: {cursor[0]}")
+                    generator = Checkpoint.after(generator, cursor)
+
+                started = time.perf_counter() if self.timing else 0
+                for log in generator:
+                    if self.timing:
+                        received = time.perf_counter()
+                        self.stages['read'].record(received - started)
+
+                    if self.stop_event.is_set():
+                        break
+
+                    self.lines_read += 1
+                    # Docker's own stamp is on every line; without it only the node's stamped lines can be resumed after
+                    if self.docker_timestamps or Checkpoint.stamped(log):
+                        self.last_line = log
+                    self.feed(log)
+
+                    if self.timing:
+                        started = time.perf_counter()
+                        self.stages['enqueue'].record(started - received)
+
+                # A follow stream only ends when the container stops; the next
+                # pass waits for its start event and resumes after last_line
+
+            except Exception as e:
+                if self.stop_event.is_set():
+                    break
+                logger.error("Error in log reader:", exc_info=e)
+                self.stop_event.wait(1)
+
+    def first_start(self):
+        # Only used when there is no local checkpoint yet, e.g. the first run after upgrading
+        name = self.source
+        try:
+            response = NexusAPI.get_latest_events(self.nexus_url, name)
+        except (requests.RequestException, ValueError) as e:
+            response = None
+            logger.warning(f"Nexus unreachable for {name}'s resume point: {e}")
+
+        if response is None:
+            # Don't wait on an unhealthy Nexus: the container's start is a local
+            # resume point that loses nothing, at the cost of resending some events
+            logger.info(f"Getting Logs Since Container Start: {self.container_data['Container Started At']}")
+            return Utils.to_epoch(self.container_data['Container Started At'])
+
+        if len(response.get('data')) > 0:
+            logger.info(f"Getting Logs Since: {response.get('data')[0].get('event_datetime')}")
+            return calendar.timegm(time.strptime(response.get('data')[0].get('event_datetime'), "%Y-%m-%d %H:%M:%S"))
+
+        return None
+
+    async def parse_stage(self):
+        name = self.source
+        cursor = None
+        # Events still held in the coalescer's window aren't in any batch yet, so
+        # what gets emitted meanwhile carries the cursor from just before the
+        # oldest of them; a crash then re-reads the window instead of losing it
+        held_cursor = None
+
+        while True:
+            lines = await self.lines.get()
+            if lines is None:
+                break
+            self.slots.release(len(lines))
+            emitted = []
+
+            for log in lines:
+                try:
+                    line = log.strip()
+                    payload = self.payload(line)
+
+                    # Most lines are chatter; drop them before decoding or any regex
+                    if not LogClassifier.interesting(payload):
+                        self.lines_filtered += 1
+                        continue
+
+                    if self.timing:
+                        event = self.timed_classify(payload, name)
+                    else:
+                        event = LogClassifier.classify_line(payload.decode('utf-8'), name)
+
+                    if not event:
+                        continue
+
+                    self.events_parsed += 1
+                    previous, cursor = cursor, Checkpoint.cursor(line)
+
+                    for observer in self.observers:
+                        observer(event)
+
+                    outs = self.coalesce(event)
+                    held = self.coalescer.held() if self.coalescer else None
+                    if held is event:
+                        held_cursor = previous
+                    safe_cursor = cursor if held is None else held_cursor
+
+                    for out in outs:
+                        emitted.append((out, safe_cursor))
+
+                except Exception as e:
+                    if self.timing:
+                        self.stages['parse'].error()
+                    logger.error("Error in parse stage:", exc_info=e)
+
+            if emitted:
+                await self.events.put(emitted)
+
+        if self.coalescer:
+            await self.events.put([(out, cursor) for out in self.coalescer.flush()])
+
+        await self.events.put(None)
+
+    def timed_classify(self, payload, name):
+        started = time.perf_counter()
+        text = payload.decode('utf-8')
+        decoded = time.perf_counter()
+        event = LogClassifier.classify_line(text, name)
+        self.stages['decode'].record(decoded - started)
+        self.stages['parse'].record(time.perf_counter() - decoded)
+
+        return event
+
+    def payload(self, line):
+        return LogFramer.payload(line) if self.docker_timestamps else line
+
+    def coalesce(self, event):
+        if not self.coalescer:
+            return [event]
+
+        events = self.coalescer.add(event)
+        self.events_coalesced += 1 - len(events)
+        return events
+
+    async def put_batch(self, cursor):
+        events = self.batcher.take()
+        if events:
+            await self.batches.put((events, cursor))
+
+    async def batch_stage(self):
+        cursor = None
+
+        while True:
+            try:
+                items = await asyncio.wait_for(self.events.get(), timeout=self.batcher.time_left())
+            except asyncio.TimeoutError:
+                await self.put_batch(cursor)
+                continue
+
+            if items is None:
+                break
+
+            for event, cursor in items:
+                if self.batcher.add(event):
+                    await self.put_batch(cursor)
+
+        if self.batcher.time_left() is not None:
+            await self.put_batch(cursor)
+
+        await self.batches.put(None)
+
+    async def spool_stage(self):
+        # A batch the sink refuses is retried until it goes through; meanwhile
+        # the bounded queues fill up and the reader stops pulling logs, so the
+        # checkpoint never moves past a batch the sink hasn't taken
+        abandoned = False
+        while True:
+            batch = await self.batches.get()
+            if batch is None:
+                break
+            if abandoned:
+                continue
+
+            events, cursor = batch
+            delay = SPOOL_RETRY_MIN
+            while not await self.spool_batch(events, cursor):
+                if self.stop_event.is_set():
+                    # What's left is re-read from the checkpoint on the next start
+                    logger.warning(f"Stream pipeline for {self.container_data['Container Name']} stopping with unspooled batches")
+                    abandoned = True
+                    break
+
+                try:
+                    await asyncio.wait_for(self.stopped.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                delay = min(delay * 2, SPOOL_RETRY_MAX)
+
+    async def spool_batch(self, events, cursor):
+        started = time.perf_counter() if self.timing else 0
+        try:
+            await asyncio.to_thread(self.sink.append, events)
+        except Exception as e:
+            if self.timing:
+                self.stages['spool'].error()
+            logger.error("Error spooling batch, retrying:", exc_info=e)
+            return False
+
+        self.batches_spooled += 1
+        # Batches of derived events only, e.g. a flushed window, carry no cursor.
+        # A checkpoint left behind only means re-reading some lines on restart
+        if cursor is not None:
+            try:
+                await asyncio.to_thread(self.checkpoint.save, cursor)
+            except Exception as e:
+                logger.error("Error saving checkpoint:", exc_info=e)
+
+        if self.timing:
+            self.stages['spool'].record(time.perf_counter() - started)
+        return True
+
+    async def report_stats(self):
+        while True:
+            await asyncio.sleep(STATS_INTERVAL)
+            logger.info(f"Stream pipeline for {self.container_data['Container Name']}: {self.stats()}")
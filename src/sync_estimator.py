@@ -0,0 +1,112 @@
+import math
+import threading
+import time
+
+import src.constants as constants
+from src.event_record import StatusRecord
+from src.utils import Utils
+
+# Time constant of the import rate EWMA in seconds of log time
+RATE_TAU = 120
+
+
+class SyncEstimator:
+    """
+    Streaming sync progress for one container, in constant memory. Every
+    status event updates an EWMA of the block import rate measured from best
+    height over log time, blocks remaining to the sync target, and an ETA.
+    Progress is stamped with wall time, so a node whose best height has not
+    moved for stall_after seconds is reported as stalled even if it stops
+    logging altogether, while a catch-up replay, which advances quickly, is not.
+    """
+
+    def __init__(self, name, stall_after=300):
+        self.name = name
+        self.stall_after = stall_after
+        self.lock = threading.Lock()
+
+        self.status = None
+        self.best = None
+        self.target = None
+        self.rate = None
+        self.sample_epoch = None
+        self.sample_best = None
+        self.progress_at = None
+
+    def observe(self, event):
+        if not isinstance(event, StatusRecord):
+            return
+
+        with self.lock:
+            self.status = event.name
+            if event.target is not None or event.name == 'Idle':
+                self.target = event.target
+
+            if self.best is None or event.best > self.best:
+                self.progress_at = time.time()
+            self.best = event.best
+
+            self.update_rate(event.epoch, event.best)
+
+    def update_rate(self, epoch, best):
+        if self.sample_epoch is None or best < self.sample_best:
+            # First sample, or the chain went backwards (resync): start over
+            self.sample_epoch, self.sample_best, self.rate = epoch, best, None
+            return
+
+        # Log timestamps have whole-second resolution; wait for time to pass
+        elapsed = epoch - self.sample_epoch
+        if elapsed <= 0:
+            return
+
+        instant = (best - self.sample_best) / elapsed
+        if self.rate is None:
+            self.rate = instant
+        else:
+            self.rate += (1 - math.exp(-elapsed / RATE_TAU)) * (instant - self.rate)
+
+        self.sample_epoch, self.sample_best = epoch, best
+
+    def snapshot(self, now=None):
+        now = now or time.time()
+
+        with self.lock:
+            if self.best is None:
+                return None
+
+            if self.status == 'Idle':
+                remaining = 0
+            elif self.target is not None:
+                remaining = max(0, self.target - self.best)
+            else:
+                remaining = None
+
+            since_progress = now - self.progress_at
+            eta = remaining / self.rate if remaining and self.rate and self.rate > 0 else None
+
+            return {
+                'Status': self.status,
+                'Best': self.best,
+                'Target': self.target,
+                'Remaining': remaining,
+                'Rate': round(self.rate, 3) if self.rate is not None else None,
+                'ETA Seconds': round(eta) if eta is not None else None,
+                'Seconds Since Progress': round(since_progress),
+                'Stalled': since_progress > self.stall_after,
+            }
+
+    def event(self, now=None):
+        # 'Sync Progress' event while the node is behind or stalled, None when it is in sync
+        now = now or time.time()
+        snapshot = self.snapshot(now)
+        if not snapshot or not (snapshot['Remaining'] or snapshot['Stalled']):
+            return None
+
+        return {
+            'Event Name': 'Sync Progress',
+            'Event Type': constants.ANALYTICS_EVENT_TYPE,
+            'Event Level': 'WARN' if snapshot['Stalled'] else 'INFO',
+            'Event Datetime': Utils.format_epoch(int(now)),
+            'Event Source': self.name,
+            'Event Data': snapshot
+        }
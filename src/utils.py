@@ -1,15 +1,65 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import re
 
+LOG_PATTERN = re.compile(
+    r'(?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z)\s+(?P<level>\w+)\s+(?P<data>.+)'
+)
+
+# Whole-second prefix ('2024-05-20T12:00:00' or '2024-05-20 12:00:00') ->
+# (epoch seconds, display string). Log lines arrive in time order and many share
+# a second, so this stays small; it is cleared rather than evicted when full.
+SECONDS_CACHE = {}
+SECONDS_CACHE_SIZE = 4096
+
+# Epoch seconds -> display string, for events formatted on their way out
+EPOCH_CACHE = {}
+
+
 class Utils:
+    @staticmethod
+    def second(date_str):
+        # Both the RFC3339 log prefix and the display format keep every field
+        # at the same offsets, so one slice-based parse serves both
+        key = date_str[:19]
+        cached = SECONDS_CACHE.get(key)
+        if cached:
+            return cached
+
+        # datetime() range-checks each field the way strptime did
+        dt = datetime(
+            int(key[0:4]), int(key[5:7]), int(key[8:10]),
+            int(key[11:13]), int(key[14:16]), int(key[17:19]),
+            tzinfo=timezone.utc
+        )
+        cached = (int(dt.timestamp()), f"{key[0:10]} {key[11:19]}")
+
+        if len(SECONDS_CACHE) >= SECONDS_CACHE_SIZE:
+            SECONDS_CACHE.clear()
+        SECONDS_CACHE[key] = cached
+
+        return cached
+
+    @staticmethod
+    def to_epoch(date_str):
+        # Epoch seconds (UTC) of a log timestamp or an 'Event Datetime' string
+        return Utils.second(date_str)[0]
+
+    @staticmethod
+    def format_epoch(epoch):
+        # Display string for epoch seconds, only needed where an event leaves the process
+        display = EPOCH_CACHE.get(epoch)
+        if display is None:
+            display = datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+            if len(EPOCH_CACHE) >= SECONDS_CACHE_SIZE:
+                EPOCH_CACHE.clear()
+            EPOCH_CACHE[epoch] = display
+
+        return display
+
     @staticmethod
     def normalize_date(date_str):
-        # Truncate the fractional seconds to 6 digits
-        truncated_date_str = date_str[:26] + 'Z'
-        # Parse the input date string
-        dt = datetime.strptime(truncated_date_str, '%Y-%m-%dT%H:%M:%S.%fZ')
-        # Return the formatted date string
-        return dt.strftime('%Y-%m-%d %H:%M:%S')
+        # '2024-05-20T12:00:00.012345678Z' -> '2024-05-20 12:00:00'
+        return Utils.second(date_str)[1]
     
     @staticmethod
     def get_prev_date(time_delta, unit):
@@ -29,10 +79,7 @@ class Utils:
     
     @staticmethod
     def parse_log(log_str):
-        log_pattern = re.compile(
-            r'(?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}\.\d+Z)\s+(?P<level>\w+)\s+(?P<data>.+)'
-        )
-        match = log_pattern.match(log_str)
+        match = LOG_PATTERN.match(log_str)
         
         if match:
             return {
@@ -0,0 +1,13 @@
+import pytest
+
+from src.event_record import ClaimRecord
+
+
+def make_claim_record(epoch, slot, source='node', claim_type='Vote'):
+    # What LogClassifier builds for a 'Claimed vote at slot=...' line
+    return ClaimRecord('Claim', 'INFO', epoch, source, slot, claim_type)
+
+
+@pytest.fixture
+def claim_record():
+    return make_claim_record
@@ -0,0 +1,30 @@
+from unittest import mock
+
+import docker
+
+from src.checkpoint import Checkpoint
+
+
+def api_client():
+    # A pinned API version keeps docker-py from asking a daemon for one
+    return docker.APIClient(base_url='tcp://127.0.0.1:1', version='1.41')
+
+
+def test_since_is_epoch_seconds():
+    assert Checkpoint.since(('2024-05-20T12:00:00.012345678Z', 0)) == 1716206400
+
+
+def test_docker_logs_accepts_checkpoint_since():
+    client = api_client()
+    cursor = Checkpoint.cursor(b'2024-05-20T12:00:00.012345678Z 2024-05-20T12:00:00.010Z INFO line')
+
+    with mock.patch.object(client, '_get') as get, mock.patch.object(client, '_get_result', return_value=iter(())):
+        client.logs('abc', since=Checkpoint.since(cursor), stream=True, follow=True, timestamps=True)
+
+    assert get.call_args.kwargs['params']['since'] == 1716206400
+
+
+def test_only_stamped_lines_can_be_resumed_after():
+    assert Checkpoint.stamped(b'2024-05-20T12:00:00.012345678Z  INFO Consensus: substrate: Idle')
+    assert not Checkpoint.stamped(b"thread 'main' panicked at 'attempt to subtract with overflow'")
+    assert not Checkpoint.stamped(b'   0: std::backtrace::Backtrace::create')
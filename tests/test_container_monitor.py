@@ -0,0 +1,35 @@
+from unittest import mock
+
+from src.container_monitor import ContainerMonitor
+
+
+def stopped_container():
+    container = mock.Mock(id='abc', status='exited')
+    container.name = 'node'
+    container.image.labels = {}
+    container.image.tags = ['ghcr.io/autonomys/node:gemini-3h-2024-may-20']
+    container.attrs = {
+        'HostConfig': {'NetworkMode': 'bridge'},
+        'NetworkSettings': {'Networks': {}},
+        'State': {'StartedAt': '2024-05-20T12:00:00.123456789Z'},
+    }
+    # What docker streams for a container that isn't running
+    container.stats.return_value = {'memory_stats': {}, 'cpu_stats': {'cpu_usage': {'total_usage': 0}}, 'precpu_stats': {}}
+    return container
+
+
+def test_stopped_container_registers_without_usage():
+    client = mock.Mock()
+    client.info.return_value = {'Name': 'host', 'OperatingSystem': 'Linux', 'NCPU': 8, 'MemTotal': 16 * 1024 ** 3}
+    client.containers.get.return_value = stopped_container()
+
+    resources = ContainerMonitor.get_container_resources('abc', client, '10.0.0.5')
+
+    assert resources['Container Name'] == 'node'
+    assert resources['Container Image'] == 'ghcr.io/autonomys/node:gemini-3h-2024-may-20'
+    assert resources['Container IP'] is None
+    assert 'Container CPU Usage Percent' not in resources
+
+
+def test_empty_stats_have_no_usage():
+    assert ContainerMonitor.get_container_usage(stopped_container().stats.return_value) is None
@@ -0,0 +1,14 @@
+from src.event_sinks import SQLiteSink
+
+
+def test_prune_returns_freed_pages(tmp_path, claim_record):
+    sink = SQLiteSink(str(tmp_path / 'events.db'), retention_days=1)
+    sink.append([claim_record(1000, slot) for slot in range(20000)])
+    sink.append([claim_record(10 ** 9, slot) for slot in range(10)])
+
+    pages = sink.db.execute('PRAGMA page_count').fetchone()[0]
+    assert sink.prune(now=10 ** 9) == 20000
+
+    assert sink.db.execute('PRAGMA freelist_count').fetchone()[0] == 0
+    assert sink.db.execute('PRAGMA page_count').fetchone()[0] < pages // 10
+    assert sink.count() == 10
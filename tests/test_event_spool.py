@@ -0,0 +1,31 @@
+from unittest import mock
+
+from src.event_batcher import EventBatcher
+from src.event_spool import EventSpool
+from src.nexus_api import NexusUnavailable
+
+
+def test_partly_sent_chunk_is_not_resent(tmp_path, claim_record):
+    spool = EventSpool(str(tmp_path))
+    spool.append([claim_record(1716206400, slot) for slot in range(5)])
+
+    posted = []
+
+    def create_event(url, body, retry=True):
+        # Nexus goes away after the third event, then comes back
+        if len(posted) == 3 and not create_event.failed:
+            create_event.failed = True
+            raise NexusUnavailable('down')
+        posted.append(body['Event Data']['Slot'])
+        return True
+
+    create_event.failed = False
+    batcher = EventBatcher('http://nexus')
+    batcher.bulk_supported = False
+    stop_event = mock.Mock(is_set=lambda: False, wait=lambda seconds: None)
+
+    with mock.patch('src.event_batcher.NexusAPI.create_event', side_effect=create_event):
+        path = spool.claim()
+        assert spool.drain_segment(path, batcher.send, 10, stop_event)
+
+    assert posted == [0, 1, 2, 3, 4]
@@ -0,0 +1,143 @@
+import os
+import re
+
+import pytest
+
+from benchmarks.log_generator import LogGenerator
+from src.log_classifier import LogClassifier
+from src.stream_monitor import StreamMonitor
+from src.utils import Utils
+
+CORPUS = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'corpus.log')
+
+# The parser LogClassifier replaced, kept as the reference: every keyword's
+# branch runs in turn with its own pattern search, a later branch overwrites
+# an earlier one and any miss drops the line
+BASELINE = [
+    ('Idle', re.compile(
+        r'Idle \((?P<peers>\d+) peers\), best: #(?P<best>\d+).*finalized #(?P<finalized>\d+).*⬇ (?P<down_speed>\d+(?:\.\d+)?)(?P<down_unit>\s?[kKMmGg]?[iI]?[bB]/s) ⬆ (?P<up_speed>\d+(?:\.\d+)?)(?P<up_unit>\s?[kKMmGg]?[iI]?[bB]/s)'
+    )),
+    ('Preparing', re.compile(
+        r'(?:(?P<bps>\d+\.\d+)\s+bps,\s*)?'
+        r'target=#(?P<target>\d+)\s+\((?P<peers>\d+)\s+peers\),\s+'
+        r'best:\s+#(?P<best>\d+)\s+\([^)]*\),\s+'
+        r'finalized\s+#(?P<finalized>\d+)\s+\([^)]*\),\s+'
+        r'⬇\s+(?P<down_speed>\d+(?:\.\d+)?)(?P<down_unit>kiB|MiB)/s\s+'
+        r'⬆\s+(?P<up_speed>\d+(?:\.\d+)?)(?P<up_unit>kiB|MiB)/s'
+    )),
+    ('Syncing', re.compile(
+        r'Consensus: substrate: ⚙️  Syncing(?:\s+(?P<bps>\d+\.\d+) bps)?, target=#(?P<target>\d+) \((?P<peers>\d+) peers\), best: #(?P<best>\d+) \([^\)]+\), finalized #(?P<finalized>\d+) \([^\)]+\), ⬇ (?P<down_speed>\d+\.\d+)(?P<down_unit>[kKmMgG][iI]?[bB]/s) ⬆ (?P<up_speed>\d+\.\d+)(?P<up_unit>[kKmMgG][iI]?[bB]/s)'
+    )),
+    ('Pending', re.compile(
+        r'Consensus: substrate: ⏳ Pending \((?P<peers>\d+) peers\), best: #(?P<best>\d+) \([^\)]+\), finalized #(?P<finalized>\d+) \([^\)]+\), ⬇ (?P<down_speed>\d+\.\d+)(?P<down_unit>[kKmMgG][iI]?[bB])/s ⬆ (?P<up_speed>\d+\.\d+)(?P<up_unit>[kKmMgG][iI]?[bB])/s'
+    )),
+    ('Claimed', re.compile(r'slot=(?P<slot>\d+)')),
+]
+
+# Written out rather than taken from LogClassifier, so unit handling is checked too
+SCALES = {'B': 1, 'kB': 1000, 'KB': 1000, 'MB': 1000 ** 2, 'kiB': 1024, 'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3}
+
+
+def bytes_per_second(speed, unit):
+    return round(float(speed) * SCALES[unit.strip().removesuffix('/s')])
+
+
+def baseline(line, name):
+    log = Utils.parse_log(line)
+    if not log:
+        return None
+
+    event = None
+    for keyword, pattern in BASELINE:
+        if keyword not in log['Event Data']:
+            continue
+
+        match = pattern.search(log['Event Data'])
+        if not match:
+            return None
+
+        groups = match.groupdict()
+        if keyword == 'Claimed':
+            data = {'Slot': int(groups['slot']), 'Claim Type': 'Vote' if 'vote' in log['Event Data'] else 'Block'}
+        else:
+            data = {
+                'Status': keyword,
+                'Peers': int(groups['peers']),
+                'Best': int(groups['best']),
+                'Target': int(groups['target']) if groups.get('target') else None,
+                'Finalized': int(groups['finalized']),
+                'BPS': float(groups['bps']) if groups.get('bps') else None,
+                # Normalized the way LogClassifier reports speeds
+                'Down Speed': bytes_per_second(groups['down_speed'], groups['down_unit']),
+                'Up Speed': bytes_per_second(groups['up_speed'], groups['up_unit']),
+                'Down Unit': 'B/s',
+                'Up Unit': 'B/s',
+            }
+
+        event = {
+            'Event Name': 'Claim' if keyword == 'Claimed' else keyword,
+            'Event Type': 'Node',
+            'Event Level': log['Event Level'],
+            'Event Datetime': log['Event Datetime'],
+            'Event Source': name,
+            'Event Data': data,
+        }
+
+    return event
+
+
+def classified(line, name):
+    record = LogClassifier.classify_line(line, name)
+    return record.to_event() if record else None
+
+
+def corpus_lines():
+    with open(CORPUS, encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f if line.strip()]
+
+
+EDGE_CASES = [
+    # Preparing without a bps figure
+    '2024-05-20T12:05:10.012345678Z  INFO Consensus: substrate: ⚙️  Preparing, target=#1300000 (12 peers), best: #1234600 (0x0a0b…0c0d), finalized #1234500 (0x0e0f…1011), ⬇ 80.4kiB/s ⬆ 12.2kiB/s',
+    # Idle with ' B/s' and 'MiB/s' speeds
+    '2024-05-20T12:00:05.012345678Z  INFO Consensus: substrate: 💤 Idle (40 peers), best: #1234568 (0x9f3a…11c2), finalized #1234468 (0x0bbe…a0d1), ⬇ 0 B/s ⬆ 1.5MiB/s',
+    '2024-05-20T12:05:15.012345678Z  INFO Consensus: substrate: ⚙️  Syncing 14.2 bps, target=#1300000 (25 peers), best: #1234671 (0x2c2d…2e2f), finalized #1234500 (0x0e0f…1011), ⬇ 2.4MiB/s ⬆ 41.7kiB/s',
+    '2024-05-20T12:00:05.640000100Z  INFO Consensus: subspace: 🗳️ Claimed vote at slot=7777777',
+    '2024-05-20T12:00:11.412345678Z  INFO Consensus: subspace: 🔖 Claimed block at slot=7777802',
+    # Keyword present, pattern doesn't match
+    '2024-05-20T12:00:12.000000000Z  WARN Consensus: sc_network: Idle connection to peer closed',
+]
+
+
+@pytest.mark.parametrize('line', EDGE_CASES)
+def test_edge_cases_match_baseline(line):
+    assert classified(line, 'node') == baseline(line, 'node')
+
+
+def test_edge_cases_classify():
+    events = [classified(line, 'node') for line in EDGE_CASES]
+
+    assert events[0]['Event Data']['BPS'] is None
+    assert (events[1]['Event Data']['Down Speed'], events[1]['Event Data']['Up Speed']) == (0, 1572864)
+    assert [event['Event Data']['Claim Type'] for event in events[3:5]] == ['Vote', 'Block']
+    assert events[5] is None
+
+
+def test_corpus_matches_baseline():
+    lines = corpus_lines()
+    assert any(classified(line, 'node') for line in lines)
+
+    for line in lines:
+        assert classified(line, 'node') == baseline(line, 'node'), line
+
+
+def test_generated_lines_match_baseline():
+    for line in LogGenerator(seed=1).lines(20000):
+        assert classified(line, 'node') == baseline(line, 'node'), line
+
+
+def test_parsed_log_path_matches_line_path():
+    # parse_event and check_log take the dict from parse_log instead of the raw line
+    for line in corpus_lines():
+        log = StreamMonitor.parse_log(line)
+        assert (StreamMonitor.parse_event(log, 'node') if log else None) == classified(line, 'node'), line
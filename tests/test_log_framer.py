@@ -0,0 +1,49 @@
+from src.log_framer import DOCKER_STAMP_BYTES, LogFramer
+
+STAMP = b'2024-05-20T12:00:00.012345678Z '
+
+
+def test_line_split_across_chunks():
+    chunks = [b'2024-05-20 INFO Consensus: ', b'substrate: Idle', b' (40 peers)\n']
+    assert list(LogFramer().lines(chunks)) == [b'2024-05-20 INFO Consensus: substrate: Idle (40 peers)']
+
+
+def test_several_lines_in_one_chunk():
+    chunks = [b'first\nsecond\n\nthird\nfou', b'rth\n']
+    assert list(LogFramer().lines(chunks)) == [b'first', b'second', b'third', b'fourth']
+
+
+def test_crlf_endings():
+    # A TTY stream may cut between the \r and the \n
+    chunks = [b'first\r\nsecond\r', b'\nthird\r\n']
+    assert list(LogFramer().lines(chunks)) == [b'first', b'second', b'third']
+
+
+def test_unterminated_tail_is_yielded_at_end_of_stream():
+    assert list(LogFramer().lines([b'first\nsec', b'ond'])) == [b'first', b'second']
+
+
+def test_long_line_without_newline_is_passed_on():
+    framer = LogFramer(max_line_bytes=8)
+    lines = framer.lines(iter([b'abcde', b'fghij', b'kl\n']))
+
+    # Handed on once the carried tail reaches the limit, not held for the newline
+    assert next(lines) == b'abcdefghij'
+    assert list(lines) == [b'kl']
+
+
+def test_long_line_with_newline_is_whole():
+    line = b'x' * 100
+    assert list(LogFramer(max_line_bytes=8).lines([line + b'\n'])) == [line]
+
+
+def test_payload_after_fixed_width_stamp():
+    line = STAMP + b'2024-05-20 12:00:00 INFO Consensus: substrate: Idle'
+    assert len(STAMP) == DOCKER_STAMP_BYTES
+    assert LogFramer.payload(line) == b'2024-05-20 12:00:00 INFO Consensus: substrate: Idle'
+
+
+def test_payload_after_short_stamp():
+    # Older daemons trim trailing zeros from the fraction
+    line = b'2024-05-20T12:00:00.0123Z 2024-05-20 12:00:00 INFO Consensus: substrate: Idle'
+    assert LogFramer.payload(line) == b'2024-05-20 12:00:00 INFO Consensus: substrate: Idle'
@@ -0,0 +1,213 @@
+import asyncio
+import itertools
+import threading
+from unittest import mock
+
+import docker
+
+from src.checkpoint import Checkpoint
+from src.stream_pipeline import StreamPipeline
+
+FIRST = b'2024-05-20T12:00:00.000000001Z 2024-05-20T12:00:00.000Z INFO first\n'
+SECOND = b'2024-05-20T12:00:05.000000001Z 2024-05-20T12:00:05.000Z INFO second\n'
+
+
+def docker_client(statuses, streams):
+    # A real docker-py client with only the HTTP round trips replaced
+    client = docker.DockerClient(base_url='tcp://127.0.0.1:1', version='1.41')
+    statuses = itertools.chain(statuses, itertools.repeat('running'))
+    client.api.inspect_container = lambda container_id: {'Id': container_id, 'State': {'Status': next(statuses)}}
+    client.api._get = mock.Mock()
+    client.api._get_result = mock.Mock(side_effect=streams)
+    return client
+
+
+def test_restart_reattaches_after_last_line(tmp_path):
+    stopped = threading.Event()
+    streams = [iter([FIRST]), iter([FIRST, SECOND]), iter(())]
+    # get, first reload, then the reload after the first stream ended finds the container stopped
+    client = docker_client(['running', 'running', 'exited'], streams)
+
+    pipeline = StreamPipeline(
+        {'Container ID': 'abc', 'Container Name': 'node'},
+        client, None, None, None, Checkpoint(str(tmp_path), 'node')
+    )
+    pipeline.first_start = lambda: None
+    fed = []
+
+    def feed(line):
+        fed.append(line)
+        if line == SECOND.strip():
+            pipeline.stop_event.set()
+            stopped.set()
+
+    pipeline.feed = feed
+    reader = threading.Thread(target=pipeline.read_logs, daemon=True)
+    reader.start()
+
+    # The docker events watcher wakes the reader once the container is running again
+    for _ in range(100):
+        if stopped.wait(0.05):
+            break
+        pipeline.wake()
+
+    reader.join(5)
+    assert not reader.is_alive()
+    assert fed == [FIRST.strip(), SECOND.strip()]
+
+    first_params = client.api._get.call_args_list[0].kwargs['params']
+    resumed_params = client.api._get.call_args_list[1].kwargs['params']
+    assert 'since' not in first_params
+    assert resumed_params['since'] == Checkpoint.since(Checkpoint.cursor(FIRST.strip()))
+
+
+class FakeContainer:
+    def __init__(self, lines):
+        self.lines = lines
+        self.status = 'running'
+
+    def reload(self):
+        pass
+
+    def logs(self, **kwargs):
+        # One stream, then the container is gone
+        lines, self.lines = self.lines, []
+        self.status = 'running' if lines else 'exited'
+        return iter(lines)
+
+
+class FakeDocker:
+    def __init__(self, containers):
+        self.containers = self
+        self.by_id = containers
+
+    def get(self, container_id):
+        return self.by_id[container_id]
+
+
+def claim(stamp, slot):
+    return f'{stamp}1Z {stamp}0Z  INFO Consensus: subspace: 🗳️ Claimed vote at slot={slot}\n'.encode()
+
+
+def test_pipelines_batch_and_checkpoint_only_their_own_events(tmp_path):
+    from src.event_batcher import EventBatcher
+    from src.stream_monitor import StreamMonitor
+
+    lines = [claim('2024-05-20T12:00:05.64000010', 1), claim('2024-05-20T12:00:06.64000010', 2)]
+    other = [claim('2024-05-20T12:00:07.64000010', 3)]
+    client = FakeDocker({'a': FakeContainer(lines), 'b': FakeContainer(other), 'c': FakeContainer([])})
+    batcher = EventBatcher(None, max_age=0.05)
+    batches = []
+    sink = mock.Mock(append=batches.append)
+
+    pipelines = [
+        StreamMonitor.create_pipeline({'Container ID': name, 'Container Name': name}, client, None, batcher, sink, str(tmp_path), 0, (), 100)
+        for name in ('a', 'b', 'c')
+    ]
+
+    async def run():
+        for pipeline in pipelines:
+            pipeline.first_start = lambda: None
+        tasks = [asyncio.create_task(pipeline.run()) for pipeline in pipelines]
+        await asyncio.sleep(0.5)
+        for pipeline in pipelines:
+            pipeline.stop()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    assert sorted([event.source for event in batch] for batch in batches) == [['a', 'a'], ['b']]
+    assert pipelines[0].checkpoint.load() == Checkpoint.cursor(lines[-1].strip())
+    assert pipelines[1].checkpoint.load() == Checkpoint.cursor(other[-1].strip())
+    assert pipelines[2].checkpoint.load() is None
+
+    # The Lines queue carries runs but reports lines, like its capacity
+    lines_queue = pipelines[0].stats()['Queues'][0]
+    assert (lines_queue['Puts'], lines_queue['Depth'], lines_queue['Capacity']) == (2, 0, 100)
+
+
+def test_first_start_falls_back_to_container_start_without_nexus(tmp_path):
+    import requests
+
+    pipeline = StreamPipeline(
+        {'Container ID': 'abc', 'Container Name': 'node', 'Container Started At': '2024-05-20 12:00:00'},
+        None, 'http://127.0.0.1:1', None, None, Checkpoint(str(tmp_path), 'node')
+    )
+
+    with mock.patch('src.nexus_api.NexusAPI.transport') as transport:
+        transport.get.side_effect = requests.ConnectionError('refused')
+        assert pipeline.first_start() == 1716206400
+
+
+def idle(stamp, best):
+    return (
+        f'{stamp}1Z {stamp}0Z  INFO Consensus: substrate: 💤 Idle (40 peers), best: #{best} (0x9f3a…11c2), '
+        f'finalized #{best - 100} (0x0bbe…a0d1), ⬇ 0 B/s ⬆ 0 B/s\n'
+    ).encode()
+
+
+def test_checkpoint_stays_behind_events_held_in_the_window(tmp_path):
+    from src.event_batcher import EventBatcher
+    from src.stream_monitor import StreamMonitor
+
+    lines = [
+        idle('2024-05-20T12:00:00.00000000', 100),
+        idle('2024-05-20T12:00:05.00000000', 101),
+        claim('2024-05-20T12:00:06.64000010', 1),
+    ]
+    client = FakeDocker({'a': FakeContainer(lines)})
+    batches = []
+    pipeline = StreamMonitor.create_pipeline(
+        {'Container ID': 'a', 'Container Name': 'a'}, client, None, EventBatcher(None, max_age=0.05),
+        mock.Mock(append=batches.append), str(tmp_path), 60, (), 100
+    )
+    pipeline.first_start = lambda: None
+    saved = []
+    pipeline.checkpoint.save = saved.append
+
+    async def run():
+        task = asyncio.create_task(pipeline.run())
+        await asyncio.sleep(0.3)
+        pipeline.stop()
+        await task
+
+    asyncio.run(run())
+
+    # The second Idle line sits in the window while the claim ships, so the
+    # checkpoint taken with the claim's batch must stop before it
+    assert [event.name for event in batches[0]] == ['Idle', 'Claim']
+    assert saved[0] == Checkpoint.cursor(lines[0].strip())
+
+
+def test_refused_batch_is_retried_before_the_checkpoint_moves(tmp_path):
+    from src.event_batcher import EventBatcher
+    from src.stream_monitor import StreamMonitor
+
+    lines = [claim('2024-05-20T12:00:05.64000010', 1)]
+    client = FakeDocker({'a': FakeContainer(lines)})
+    batches = []
+
+    def append(events):
+        # The sink is down for the first attempt
+        if not batches:
+            batches.append(None)
+            raise OSError('disk full')
+        batches.append(events)
+
+    pipeline = StreamMonitor.create_pipeline(
+        {'Container ID': 'a', 'Container Name': 'a'}, client, None, EventBatcher(None, max_age=0.05),
+        mock.Mock(append=append), str(tmp_path), 0, (), 100
+    )
+    pipeline.first_start = lambda: None
+
+    async def run():
+        task = asyncio.create_task(pipeline.run())
+        await asyncio.sleep(0.3)
+        pipeline.stop()
+        await task
+
+    with mock.patch('src.stream_pipeline.SPOOL_RETRY_MIN', 0.05):
+        asyncio.run(run())
+
+    assert [[event.name for event in batch] for batch in batches[1:]] == [['Claim']]
+    assert pipeline.checkpoint.load() == Checkpoint.cursor(lines[-1].strip())
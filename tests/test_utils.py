@@ -0,0 +1,36 @@
+import calendar
+from datetime import datetime
+
+import pytest
+
+from src.utils import SECONDS_CACHE, Utils
+
+
+def reference(date_str):
+    # What normalize_date did before the slice parse: strptime on the stamp cut to 6 fraction digits
+    dt = datetime.strptime(date_str[:26] + 'Z', '%Y-%m-%dT%H:%M:%S.%fZ')
+    return calendar.timegm(dt.timetuple()), dt.strftime('%Y-%m-%d %H:%M:%S')
+
+
+@pytest.mark.parametrize('date_str', [
+    '2024-05-20T12:00:00.012345Z',
+    '2024-05-20T12:00:00.0123456Z',
+    '2024-05-20T12:00:00.012345678Z',
+    '2024-02-29T23:59:59.999999999Z',
+    '1999-12-31T00:00:01.000000000Z',
+])
+def test_second_matches_strptime(date_str):
+    SECONDS_CACHE.clear()
+    assert Utils.second(date_str) == reference(date_str)
+    # And again from the cache
+    assert Utils.second(date_str) == reference(date_str)
+
+
+def test_second_accepts_display_format():
+    assert Utils.second('2024-05-20 12:00:00') == reference('2024-05-20T12:00:00.000000Z')
+
+
+def test_second_rejects_impossible_dates():
+    SECONDS_CACHE.clear()
+    with pytest.raises(ValueError):
+        Utils.second('2023-02-29T12:00:00.000000000Z')